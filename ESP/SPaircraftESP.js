@@ -32,7 +32,11 @@ window.gp = {
 
   awaiting_response: false,
   last_sent: null,
+  job: null,
   sendpmtrs: function() {
+    // cancel the stale solve before requesting a new one
+    if (gp.job !== null)
+      gp.websocket.send(JSON.stringify({cancel: gp.job}))
     gp.dom.optimizeButton.innerText = "Optimizing..."
     gp.dom.optimizeButton.style.backgroundColor = "#DA70D6"
     gp.optcount++
@@ -54,8 +58,25 @@ window.gp = {
 gp.websocket.onmessage = function(evt) {
   data = JSON.parse(evt.data);
   console.log("Data received:", data)
-  postMessage("GP: " + data.msg)
   console.log(data.status)
+  if (data.status == "queued") {
+    // the solve runs in the background; its result arrives in a later message
+    gp.job = data.job
+    return
+  }
+  if (data.status == "progress") {
+    if (data.job == gp.job)
+      gp.dom.optimizeButton.innerText = "Optimizing... (iteration " + data.iteration + ")"
+    return
+  }
+  if (data.status == "cancelled") {
+    if (data.job == gp.job)
+      gp.job = null
+    return
+  }
+  if (data.job == gp.job)
+    gp.job = null
+  postMessage("GP: " + data.msg)
   if (data.status == "optimal") {
     gp.dom.optimizeButton.innerText = "Optimized"
     gp.dom.optimizeButton.style.backgroundColor = null
@@ -1,89 +1,129 @@
 """
 Script to run the SP aircraft model
+
+Importing this module is cheap: the aircraft model, the substitution
+dictionaries and the post-processing, plotting and VSP/ESP helpers are only
+imported by the functions that use them. The demo optimization runs from
+the command line (python SPaircraft.py --help, or the spaircraft-demo
+command once installed).
 """
 from __future__ import print_function
 from __future__ import absolute_import
 import sys
+import argparse
 
 # GPkit tools
 from gpkit import units, Model
-from gpkit import Variable, Model, units, SignomialsEnabled, SignomialEquality, Vectorize
 from gpkit.constraints.bounded import Bounded
 
-# Mission model
-from aircraft import Mission
-
-# Substitution dictionaries for different aircraft
-from subs.optimalD8 import get_optimalD8_subs
-from subs.optimal777 import get_optimal777_subs
-from subs.optimal737 import get_optimal737_subs
-from subs.M072_737 import get_M072_737_subs
-from subs.D8_no_BLI import get_D8_no_BLI_subs
-from subs.D8_eng_wing import get_D8_eng_wing_subs
-
-# Plotting tools
-#from gen_plots import *
+# Solve pipeline instrumentation
+from timing import NullTimer
 
-# File for calculating values after solution
-from post_compute import post_compute
-
-# Solution check tool relative to TASOPT
-from percent_diff import percent_diff
-
-# VSP visualization tools
-from saveSol import updateOpenVSP, gendes, gencsm
+# Engine option substitutions (importing subs does not load any configuration)
+from subs import engine_options
 
 # Aircraft options:
 # currently one of: 'D8_eng_wing', 'optimal737', 'optimal777', 'optimalD8', 'D8_no_BLI', 'M072_737'
 
-def optimize_aircraft(m, substitutions, fixedBPR=False, pRatOpt=True, x0 = None):
+def optimize_aircraft(m, substitutions, fixedBPR=False, pRatOpt=True, x0 = None, warmstart = None,
+                      timer = None):
     """
     Optimizes an aircraft of a given configuration
     :param m: aircraft model with objective and configuration
+    :param substitutions: substitution dic, or a case of subs.registry.compile_subs
     :param fixedBPR: boolean specifying whether or not BPR is fixed (depends on config)
     :param pRatOpt: boolean specifying whether or not pressure ratio is optimized (depends on config)
+    :param x0: initial guess for the SP iterations, keyed by varkeys
+    :param warmstart: WarmStartStore to draw x0 from (if not given) and to record the solution in
+    :param timer: SolveTimer recording the time and memory of each phase and SP iteration
     :return: solution of aircraft model
     """
-
-    if fixedBPR:
-        substitutions.update({
-            '\\alpha_{max}': 6.97, #8.62,
-        })
-
-    if pRatOpt:
-        del substitutions['\pi_{f_D}']
-        del substitutions['\pi_{lc_D}']
-        del substitutions['\pi_{hc_D}']
-
-    m.substitutions.update(substitutions)
-    m = Model(m.cost, Bounded(m), m.substitutions)
-    sol = m.localsolve(verbosity=2, iteration_limit=200, reltol=0.01)
+    if timer is None:
+        timer = NullTimer()
+
+    with timer.phase('substitutions'):
+        if hasattr(substitutions, 'apply'):
+            # compiled by subs.registry, with the engine options already applied
+            substitutions.apply(m)
+        else:
+            m.substitutions.update(engine_options(substitutions, fixedBPR, pRatOpt))
+    if warmstart is not None and x0 is None:
+        with timer.phase('warmstart_lookup'):
+            x0 = warmstart.lookup(m)
+    mission = m
+    with timer.phase('bounded'):
+        m = Model(m.cost, Bounded(m), m.substitutions)
+    with timer.phase('localsolve'):
+        with timer.iterations():
+            sol = m.localsolve(verbosity=2, iteration_limit=200, reltol=0.01, x0=x0)
+    if warmstart is not None:
+        with timer.phase('warmstart_record'):
+            warmstart.record(mission, sol)
     return sol
 
-def test():
-    Nclimb = 3 # number of climb segments
-    Ncruise = 2 # number of cruise segments
-    Nmission = 1 # number of missions
-    config = 'optimalD8' # String describing configuration:
-    # currently one of: 'D8_eng_wing', 'optimal737', 'optimal777', 'optimalD8', 'D8_no_BLI', 'M072_737'
-    m = Mission(Nclimb, Ncruise, config, Nmission)
+def demo(config='optimalD8', Nclimb=3, Ncruise=2, Nmission=1, R_req=3000., n_pass=180.,
+         fixedBPR=False, pRatOpt=True, timer=None, post=True):
+    """
+    Builds and optimizes an aircraft for minimum fuel burn, checks it against
+    TASOPT and stores the solution
+    :param config: configuration string
+    :param R_req: required range [nmi]
+    :param n_pass: number of passengers
+    :param post: whether to run percent_diff and post_compute on the solution
+    :return: solution of aircraft model
+    """
+    from aircraft import Mission
+    from subs import get_subs
+    from solstore import SolutionStore
+
+    if timer is None:
+        timer = NullTimer()
+    with timer.phase('mission'):
+        m = Mission(Nclimb, Ncruise, config, Nmission)
 
     # Objective
     m.cost = m['W_{f_{total}}'].sum()
 
     # Inputs to the model
-    substitutions = get_optimalD8_subs()
-    substitutions.update({'R_{req}': 3000.*units('nmi'), #6000*units('nmi'),
-                         'n_{pass}': 180.})              #450.,)
-
-    # Additional options
-    fixedBPR = False
-    pRatOpt = True
-    sol = optimize_aircraft(m, substitutions, fixedBPR, pRatOpt)
-
-    percent_diff(sol, config, Nclimb)
-    post_compute(sol, Nclimb)
-    sol.savetxt()
+    substitutions = get_subs(config)
+    substitutions.update({'R_{req}': R_req*units('nmi'),
+                          'n_{pass}': n_pass})
+
+    sol = optimize_aircraft(m, substitutions, fixedBPR, pRatOpt, timer=timer)
+
+    if post:
+        from percent_diff import percent_diff
+        from post_compute import post_compute
+        with timer.phase('percent_diff'):
+            percent_diff(sol, config, Nclimb)
+        with timer.phase('post_compute'):
+            post_compute(sol, Nclimb)
+    with timer.phase('store'):
+        SolutionStore('sols/solutions.h5').append(sol, m, config)
     return sol
 
-sol = test()
+def test(timer=None):
+    return demo(timer=timer)
+
+def main(argv=None):
+    "command line entry point of the demo optimization"
+    parser = argparse.ArgumentParser(description="Optimizes an aircraft for minimum fuel burn")
+    parser.add_argument('--config', default='optimalD8',
+                        choices=['D8_eng_wing', 'optimal737', 'optimal777', 'optimalD8',
+                                 'D8_no_BLI', 'M072_737'])
+    parser.add_argument('--Nclimb', type=int, default=3, help='number of climb segments')
+    parser.add_argument('--Ncruise', type=int, default=2, help='number of cruise segments')
+    parser.add_argument('--range', type=float, default=3000., help='required range [nmi]')
+    parser.add_argument('--npass', type=float, default=180., help='number of passengers')
+    parser.add_argument('--fixedBPR', action='store_true', help='fix the bypass ratio')
+    parser.add_argument('--no-pRatOpt', dest='pRatOpt', action='store_false',
+                        help='fix the fan and compressor pressure ratios')
+    parser.add_argument('--no-post', dest='post', action='store_false',
+                        help='skip the TASOPT comparison and post-processing')
+    args = parser.parse_args(argv)
+    demo(args.config, args.Nclimb, args.Ncruise, 1, args.range, args.npass,
+         args.fixedBPR, args.pRatOpt, post=args.post)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,6 +19,7 @@ from wing import Wing
 from turbofan.engine_validation import Engine
 from fuselage import Fuselage
 from landing_gear import LandingGear
+from aircraft_config import get_config
 
 # for ESP
 from collections import OrderedDict
@@ -47,11 +48,19 @@ class Aircraft(Model):
 
     ARGUMENTS
     ---------
-    BLI: True = have engine stagnation pressure drop drom BLI, False = no engine stagnation pressure drop
-    fitDrag: True = use Martin's tail drag fits, False = use the TASOPT tail drag model
+    config: configuration name or aircraft_config.AircraftConfig, which sets the
+            geometry flags, the engine model, BLI and the tail drag model
     """
 
-    def setup(self, Nclimb, Ncruise, flightstate, eng, fitDrag, BLI = False, Nmissions=0,  **kwargs):
+    def setup(self, Nclimb, Ncruise, flightstate, config, Nmissions=0, **kwargs):
+        # geometry flags of this aircraft's configuration
+        self.configuration = config = get_config(config)
+        self.config = config.name
+        wingengine = config.wingengine; rearengine = config.rearengine;
+        doublebubble = config.doublebubble; tube = config.tube;
+        piHT = config.piHT; conventional = config.conventional;
+        BLI = config.BLI; eng = config.eng;
+
         # create submodels
         self.fuse = Fuselage(Nmissions)
         self.wing = Wing()
@@ -64,7 +73,7 @@ class Aircraft(Model):
         self.LG = LandingGear()
 
         #set the tail drag flag
-        self.fitDrag = fitDrag
+        self.fitDrag = config.fitDrag
 
         # variable definitions
         numaisle = Variable('n_{aisle}','-','Number of Aisles')
@@ -500,6 +509,8 @@ class AircraftP(Model):
     def setup(self, aircraft, state):
         # make submodels
         self.aircraft = aircraft
+        conventional = aircraft.configuration.conventional
+        piHT = aircraft.configuration.piHT
         self.wingP = aircraft.wing.dynamic(state)
         self.fuseP = aircraft.fuse.dynamic(state)
         self.VTP = aircraft.VT.dynamic(state, aircraft.fitDrag)
@@ -731,54 +742,24 @@ class Mission(Model):
     Nclimb: number of climb segments (for Breguet Range)
     Ncruise: number of cruise segments (for Breguet Range)
     objective: defines the objective function
-    aircraft: string representing the aircraft model
+    config: configuration name (e.g. 'optimalD8') or aircraft_config.AircraftConfig
     Nmission: specifies whether single-point or multi-point optimization
               Nmission >/= 1 requires specification of range and number of passengers for each mission
     """
 
     def setup(self, Nclimb, Ncruise, config, Nmission = 1):
-        # define global variables
-        global wingengine, rearengine, doublebubble, tube, piHT, conventional
-        global largeAC, multimission
-
         self.Nclimb = Nclimb
         self.Ncruise = Ncruise
         self.Nmission = Nmission
 
-        # aircraft geometry flags
-        wingengine = False; rearengine = False; doublebubble = False; tube = False;
-        piHT = False; conventional = False; BLI = False; eng = 0;
-
-        # Aircraft type, only one active at once
-        largeAC = False
-
-        # set geometry flags based on config type
-        if config == 'D8_eng_wing':
-            wingengine = True; piHT = True; doublebubble = True; eng = 3; BLI = False;
-        if config == 'optimal737':
-            conventional = True; eng = 3; BLI = False;
-        if config == 'optimalD8':
-            optimalD8 = True; rearengine = True; piHT = True; doublebubble = True; eng = 3; BLI = True;
-        if config == 'optimal777':
-            largeAC = True; conventional = True; eng = 4; BLI = False;
-        if config == 'M072_737':
-            conventional = True; eng = 3; BLI = False;
-        if config == 'D8_no_BLI':
-            rearengine = True; piHT = True; doublebubble = True; eng = 3; BLI = False;
-
-        # if conventional choose wing engine and tube fuselage
-        if conventional:
-            wingengine = True; tube = True;
+        # aircraft geometry flags, read from this mission's own configuration
+        self.configuration = config = get_config(config)
+        wingengine = config.wingengine; rearengine = config.rearengine;
+        doublebubble = config.doublebubble; conventional = config.conventional;
+        largeAC = config.largeAC;
 
         # Multimission?
-        if Nmission == 1:
-            multimission = False
-        else:
-            multimission = True
-
-        # Defining fitDrag, boolean describing whether or not to use XFOIL tail drag fits
-        # False uses TASOPT tail drag model. Currently on.
-        fitDrag = True
+        multimission = Nmission != 1
 
         # vectorize
         with Vectorize(Nmission):
@@ -786,13 +767,13 @@ class Mission(Model):
                  self.flightstate = flightstate = FlightState()
 
         # Build required submodels
-        self.aircraft = aircraft = Aircraft(Nclimb, Ncruise, flightstate, eng, fitDrag, BLI, Nmission)
-        self.aircraft.config = config
+        self.aircraft = aircraft = Aircraft(Nclimb, Ncruise, flightstate, config, Nmission)
 
         # Vectorize dynamic variables
         with Vectorize(Nmission):
              with Vectorize(Nclimb+Ncruise):
                  self.flight = flight = FlightSegment(aircraft, flightstate, Nclimb, Ncruise)
+                 W_fremaining = Variable('W_{f_{remaining}}', 'lbf', 'Fuel Weight Remaining (end of segment)')
 
         # Declare Mission variables
         if multimission:
@@ -981,13 +962,13 @@ class Mission(Model):
                 ])
 
         ## ------------------------ PERCENT FUEL REMAINING -------------------
-        with SignomialsEnabled():
-            for i in range(0, Nclimb+Ncruise):
-                constraints.extend([
-                    TCS([flight['F_{fuel}'][i] >= (sum(flight['W_{burn}'][i+1:]) + \
-                                0.0000001*aircraft['W_{f_{primary}}'])/aircraft['W_{f_{primary}}']]),
-                    flight['F_{fuel}'] <= 1.0000001, #just in case, TODO remove later
-                    ])
+        # fuel remaining after each segment, accumulated backwards from the last segment
+        constraints.extend([
+            TCS([W_fremaining[:-1] >= W_fremaining[1:] + flight['W_{burn}'][1:]]),
+            TCS([W_fremaining[-1] >= 0.0000001*aircraft['W_{f_{primary}}']]),
+            TCS([flight['F_{fuel}'] >= W_fremaining/aircraft['W_{f_{primary}}']]),
+            flight['F_{fuel}'] <= 1.0000001, #just in case, TODO remove later
+            ])
 
         ## ---------------------- MULTIMISSION SETUP --------------------------
         if multimission:
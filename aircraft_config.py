@@ -0,0 +1,156 @@
+"""
+Geometry and engine configurations of the aircraft model
+
+Each Mission (and the Aircraft it builds) reads its flags from its own
+AircraftConfig, so models of different configurations can be built one
+after another in one process without resetting any module state.
+
+Only the flag combinations the model has constraints for are accepted:
+double-bubble fuselages with the pi-tail (rear or wing engines), and
+tube fuselages with wing engines and a conventional tail. A configuration's
+name keys its substitutions, so it has to be one of subs.CONFIG_SUBS or
+match a pattern registered by a generator of configurations (family.py).
+
+Building models concurrently in threads is still NOT supported: gpkit's
+variable naming and Vectorize state are global, so models built at the
+same time in different threads can get each other's variable names and
+vector lengths. Build models in one thread, or in separate processes
+(batch.py, family.py).
+
+Usage:
+    from aircraft_config import get_config, AircraftConfig
+    config = get_config('optimalD8')
+    m = Mission(3, 2, config)
+    m = Mission(3, 2, 'optimalD8')      # same configuration, by name
+"""
+from __future__ import absolute_import
+import re
+import hashlib
+
+from subs import CONFIG_SUBS
+
+# Name patterns of generated configurations, whose substitutions are
+# generated with them instead of being read from subs (see register_generated)
+GENERATED = []
+
+def register_generated(pattern):
+    """
+    Accepts the configuration names matching a pattern
+    :param pattern: regular expression the whole name has to match
+    """
+    GENERATED.append(re.compile(pattern + r"\Z"))
+
+def known_name(name):
+    "whether a configuration name has substitutions"
+    return name in CONFIG_SUBS or any(pattern.match(name) for pattern in GENERATED)
+
+class AircraftConfig(object):
+    """
+    Geometry and engine flags of one aircraft configuration
+
+    ARGUMENTS
+    ---------
+    name: configuration name, which keys the substitutions, cached models and solutions
+    engine: 'wing' = wing-mounted engines, 'rear' = rear-mounted engines
+    fuselage: 'tube' = single bubble fuselage, 'doublebubble' = D8 double bubble fuselage
+    piHT: True = pi-tail with the HT mounted on the VTs, False = conventional tail
+    BLI: True = rear engines ingest the fuselage boundary layer
+    eng: engine model of the turbofan package (3 = 737/D8 class, 4 = 777 class)
+    largeAC: True = wide-body (777 class) aircraft constraints
+    fitDrag: True = use Martin's XFOIL tail drag fits, False = use the TASOPT tail drag model
+    """
+
+    FLAGS = ['engine', 'fuselage', 'piHT', 'BLI', 'eng', 'largeAC', 'fitDrag']
+
+    def __init__(self, name, engine='rear', fuselage='doublebubble', piHT=True, BLI=False,
+                 eng=3, largeAC=False, fitDrag=True):
+        if engine not in ('wing', 'rear'):
+            raise ValueError("engine must be 'wing' or 'rear', not %r" % (engine,))
+        if fuselage not in ('tube', 'doublebubble'):
+            raise ValueError("fuselage must be 'tube' or 'doublebubble', not %r" % (fuselage,))
+        if BLI and engine != 'rear':
+            raise ValueError("BLI requires rear-mounted engines")
+        if fuselage == 'doublebubble' and not piHT:
+            raise ValueError("the double-bubble fuselage is only modeled with the pi-tail")
+        if fuselage == 'tube' and (piHT or engine != 'wing'):
+            raise ValueError("the tube fuselage is only modeled with wing-mounted engines "
+                             "and a conventional tail")
+        if largeAC and fuselage != 'tube':
+            raise ValueError("largeAC is only modeled with the tube fuselage")
+        if not known_name(name):
+            raise ValueError("unknown configuration name %r, expected one of %s or a "
+                             "generated configuration" % (name, ", ".join(sorted(CONFIG_SUBS))))
+        self.name = name
+        self.engine = engine
+        self.fuselage = fuselage
+        self.piHT = piHT
+        self.BLI = BLI
+        self.eng = eng
+        self.largeAC = largeAC
+        self.fitDrag = fitDrag
+
+    # flags of the model constraints
+    @property
+    def wingengine(self):
+        return self.engine == 'wing'
+
+    @property
+    def rearengine(self):
+        return self.engine == 'rear'
+
+    @property
+    def tube(self):
+        return self.fuselage == 'tube'
+
+    @property
+    def doublebubble(self):
+        return self.fuselage == 'doublebubble'
+
+    @property
+    def conventional(self):
+        "tube and wing aircraft with a conventional tail"
+        return self.tube and self.wingengine and not self.piHT
+
+    def flags(self):
+        return tuple(getattr(self, flag) for flag in self.FLAGS)
+
+    def digest(self):
+        "short hash of the flags, for keys of configurations sharing a name"
+        return hashlib.sha1(repr(self.flags()).encode()).hexdigest()[:8]
+
+    def __eq__(self, other):
+        return isinstance(other, AircraftConfig) and \
+            (self.name, self.flags()) == (other.name, other.flags())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((self.name, self.flags()))
+
+    def __repr__(self):
+        return "AircraftConfig(%r, %s)" % (self.name, ", ".join(
+            "%s=%r" % (flag, getattr(self, flag)) for flag in self.FLAGS))
+
+# Supported configurations
+CONFIGS = {
+    'optimalD8': AircraftConfig('optimalD8', 'rear', 'doublebubble', piHT=True, BLI=True),
+    'D8_no_BLI': AircraftConfig('D8_no_BLI', 'rear', 'doublebubble', piHT=True),
+    'D8_eng_wing': AircraftConfig('D8_eng_wing', 'wing', 'doublebubble', piHT=True),
+    'optimal737': AircraftConfig('optimal737', 'wing', 'tube', piHT=False),
+    'M072_737': AircraftConfig('M072_737', 'wing', 'tube', piHT=False),
+    'optimal777': AircraftConfig('optimal777', 'wing', 'tube', piHT=False, eng=4, largeAC=True),
+}
+
+def get_config(config):
+    """
+    Returns the AircraftConfig of a configuration
+    :param config: configuration name or AircraftConfig
+    """
+    if isinstance(config, AircraftConfig):
+        return config
+    try:
+        return CONFIGS[config]
+    except KeyError:
+        raise ValueError("unknown configuration %r, expected one of %s"
+                         % (config, ", ".join(sorted(CONFIGS))))
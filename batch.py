@@ -0,0 +1,78 @@
+"""
+Batch solving of independent aircraft cases across worker processes
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+from multiprocessing import Pool, cpu_count
+
+from model_cache import load_mission
+from SPaircraft import optimize_aircraft
+from subs import get_subs
+from sweep import SOLVE_FAILURES
+
+def case_objective(m, objective):
+    """
+    Returns the objective of a case
+    :param m: Mission model
+    :param objective: variable name, or (variable name, index) for a single element
+    :return: posynomial to minimize
+    """
+    if isinstance(objective, tuple):
+        name, index = objective
+        return m[name][index]
+    return m[objective].sum()
+
+def solve_case(case):
+    """
+    Builds and solves a single aircraft case
+    :param case: dictionary with the case specification:
+        config: configuration string or aircraft_config.AircraftConfig (required)
+        Nclimb, Ncruise, Nmission: mission discretization (default 3, 2, 1)
+        objective: see case_objective (default 'W_{f_{total}}')
+        base_substitutions: substitutions used instead of the configuration's
+                            defaults, e.g. those of a generated configuration
+        substitutions: substitutions applied on top of the configuration's defaults
+        fixedBPR, pRatOpt: options passed to optimize_aircraft (default False, True)
+    :return: solution of the case
+    """
+    config = case['config']
+    m = load_mission(case.get('Nclimb', 3), case.get('Ncruise', 2), config,
+                     case.get('Nmission', 1))
+    m.cost = case_objective(m, case.get('objective', 'W_{f_{total}}'))
+
+    if 'base_substitutions' in case:
+        substitutions = dict(case['base_substitutions'])
+    else:
+        substitutions = get_subs(config)
+    substitutions.update(case.get('substitutions', {}))
+    return optimize_aircraft(m, substitutions, case.get('fixedBPR', False),
+                             case.get('pRatOpt', True))
+
+def solve_case_or_none(case):
+    "solves a case like solve_case, returning None if the solve fails"
+    try:
+        return solve_case(case)
+    except SOLVE_FAILURES as e:
+        print("Case %s failed: %r" % (getattr(case['config'], 'name', case['config']), e))
+        return None
+
+def solve_cases(cases, workers=None, skip_failures=False):
+    """
+    Solves independent aircraft cases, each in its own worker process
+    :param cases: list of case specifications (see solve_case)
+    :param workers: number of worker processes (default: one per CPU);
+                    workers=1 solves the cases in the calling process
+    :param skip_failures: return None for the cases that fail to solve,
+                          instead of raising the first failure
+    :return: list of solutions, in the order of the cases
+    """
+    solve = solve_case_or_none if skip_failures else solve_case
+    workers = min(workers or cpu_count(), len(cases))
+    if workers <= 1:
+        return [solve(case) for case in cases]
+    pool = Pool(workers)
+    try:
+        return pool.map(solve, cases, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
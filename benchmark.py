@@ -0,0 +1,294 @@
+"""
+Performance benchmark of building and solving each supported configuration
+
+Usage:
+    python benchmark.py                      # run and compare against the baseline
+    python benchmark.py --save-baseline      # run and store the results as the new baseline
+    python benchmark.py --configs optimalD8 --sizes 3,2,1 5,4,1
+    python benchmark.py --scaling --climb 2 4 8 --cruise 2 4 8 16 --missions 1 2
+    python benchmark.py --startup            # import time of each entry point
+
+--scaling runs every Nclimb x Ncruise x Nmission combination and fits each
+metric to a power law a*N**b of the number of flight segments
+N = (Nclimb + Ncruise)*Nmission, instead of comparing against the baseline.
+
+--startup imports each entry point in a fresh interpreter under
+`python -X importtime` and reports its cumulative import time and its
+slowest direct imports, which is the cold start cost of a batch worker.
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import subprocess
+from multiprocessing import Pool
+import numpy as np
+
+from gpkit import units
+
+# Benchmarked configurations, with their missions and engine options
+CONFIGS = {
+    'optimalD8':   {'R_{req}': 3000., 'n_{pass}': 180., 'fixedBPR': False, 'pRatOpt': True},
+    'optimal737':  {'R_{req}': 3000., 'n_{pass}': 180., 'fixedBPR': True, 'pRatOpt': False},
+    'optimal777':  {'R_{req}': 6000., 'n_{pass}': 450., 'fixedBPR': False, 'pRatOpt': False},
+    'M072_737':    {'R_{req}': 3000., 'n_{pass}': 180., 'fixedBPR': True, 'pRatOpt': False},
+    'D8_no_BLI':   {'R_{req}': 3000., 'n_{pass}': 180., 'fixedBPR': True, 'pRatOpt': False},
+    'D8_eng_wing': {'R_{req}': 3000., 'n_{pass}': 180., 'fixedBPR': True, 'pRatOpt': False},
+}
+
+# (Nclimb, Ncruise, Nmission) discretizations
+SIZES = [(3, 2, 1), (4, 4, 1), (3, 2, 2)]
+
+# Allowed relative increase of each metric over the baseline
+THRESHOLDS = {'build_time': 0.25, 'solve_time': 0.25, 'iterations': 0.10, 'peak_rss_kb': 0.15}
+
+BASELINE = 'benchmark_baseline.json'
+
+# Metrics fitted against the number of flight segments by --scaling
+SCALING_METRICS = ['variables', 'monomials', 'signomial_equalities',
+                   'build_time', 'solve_time', 'iterations']
+
+def case_name(config, Nclimb, Ncruise, Nmission):
+    return "%s/%i-%i-%i" % (config, Nclimb, Ncruise, Nmission)
+
+def mission_subs(config, Nmission):
+    """
+    Returns the substitutions of a benchmark case
+    """
+    from subs import get_subs
+    options = CONFIGS[config]
+    substitutions = get_subs(config)
+    if Nmission == 1:
+        substitutions.update({'R_{req}': options['R_{req}']*units('nmi'),
+                              'n_{pass}': options['n_{pass}']})
+    else:
+        substitutions.update({'R_{req}': [options['R_{req}']]*Nmission*units('nmi'),
+                              'n_{pass}': [options['n_{pass}']]*Nmission})
+    return substitutions
+
+def model_size(m):
+    """
+    Returns the number of variables, scalar constraints, monomials and
+    scalar SignomialEqualities of a model
+    """
+    try:
+        from gpkit.nomials.math import SingleSignomialEquality as ScalarSignomialEquality
+    except ImportError:  # older gpkit flattens vector SignomialEqualities to scalar ones
+        from gpkit import SignomialEquality as ScalarSignomialEquality
+
+    try:
+        constraints = list(m.flat(constraintsets=False))
+    except TypeError:  # newer gpkit only yields constraints
+        constraints = list(m.flat())
+    monomials = sum(len(side.exps) if hasattr(side, 'exps') else 1
+                    for c in constraints for side in (c.left, c.right))
+    return {'variables': len(m.varkeys), 'constraints': len(constraints),
+            'monomials': monomials,
+            'signomial_equalities': sum(isinstance(c, ScalarSignomialEquality)
+                                        for c in constraints)}
+
+def run_case(case):
+    """
+    Builds and solves one benchmark case; meant to run in a fresh process
+    :param case: (config, Nclimb, Ncruise, Nmission) tuple
+    :return: dictionary of measured metrics
+    """
+    from aircraft import Mission
+    from SPaircraft import optimize_aircraft
+    from timing import SolveTimer, peak_rss_kb
+
+    config, Nclimb, Ncruise, Nmission = case
+    options = CONFIGS[config]
+    start = time.time()
+    m = Mission(Nclimb, Ncruise, config, Nmission)
+    m.cost = m['W_{f_{total}}'].sum()
+    build_time = time.time() - start
+
+    timer = SolveTimer()
+    start = time.time()
+    optimize_aircraft(m, mission_subs(config, Nmission), options['fixedBPR'],
+                      options['pRatOpt'], timer=timer)
+    result = {'case': case_name(*case),
+              'segments': (Nclimb + Ncruise)*Nmission,
+              'build_time': build_time,
+              'solve_time': time.time() - start,
+              'iterations': timer.n_iterations,
+              'peak_rss_kb': peak_rss_kb()}
+    result.update(model_size(m))
+    return result
+
+def run_benchmark(cases):
+    """
+    Runs each case in its own process, so that peak memory is per-case
+    :return: dictionary of {case name: metrics}
+    """
+    results = {}
+    for case in cases:
+        pool = Pool(1, maxtasksperchild=1)
+        try:
+            result = pool.apply(run_case, (case,))
+        finally:
+            pool.close()
+            pool.join()
+        print("%-24s build %7.2f s  solve %7.2f s  %3i iterations  %9.0f kB"
+              "  %6i variables  %7i monomials" % (
+                  result['case'], result['build_time'], result['solve_time'],
+                  result['iterations'], result['peak_rss_kb'], result['variables'],
+                  result['monomials']))
+        results[result['case']] = result
+    return results
+
+def fit_scaling(results, metrics=SCALING_METRICS):
+    """
+    Fits each metric of each configuration to a*N**b, N being the number of segments
+    :return: dictionary of {config: {metric: (a, b)}}
+    """
+    fits = {}
+    for config in sorted(set(name.split('/')[0] for name in results)):
+        mine = [r for name, r in results.items() if name.split('/')[0] == config]
+        segments = np.array([r['segments'] for r in mine], dtype=float)
+        fits[config] = {}
+        for metric in metrics:
+            values = np.array([r[metric] for r in mine], dtype=float)
+            usable = values > 0
+            if len(set(segments[usable])) < 2:
+                continue
+            b, loga = np.polyfit(np.log(segments[usable]), np.log(values[usable]), 1)
+            fits[config][metric] = (np.exp(loga), b)
+    return fits
+
+# Modules imported by the scripts and worker processes, for --startup
+ENTRY_POINTS = ['SPaircraft', 'batch', 'sweep', 'model_cache', 'server', 'killer_plots',
+                'objective_table']
+
+# "import time: self [us] | cumulative | imported package" lines of -X importtime
+IMPORT_TIME = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)\s*$")
+
+def import_time(module, top=5):
+    """
+    Imports a module in a fresh interpreter under -X importtime
+    :param top: number of the slowest direct imports to report
+    :return: dictionary of the import time, the interpreter's wall time and
+             the slowest imports, or of the error if the import failed
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    start = time.time()
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                               cwd=here, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               universal_newlines=True)
+    stderr = process.communicate()[1]
+    wall_time = time.time() - start
+
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match:
+            imports.append((len(match.group(3))//2, match.group(4), int(match.group(2))*1e-3))
+    if process.returncode:
+        return {'module': module, 'wall_time': wall_time,
+                'error': stderr.strip().splitlines()[-1] if stderr.strip() else "failed"}
+
+    # the module is the last top level line, after the lines of its own imports;
+    # the top level lines before those are the interpreter's startup imports
+    end = max(i for i, (depth, name, _) in enumerate(imports) if depth == 0 and name == module)
+    begin = max([i + 1 for i, (depth, _, _) in enumerate(imports[:end]) if depth == 0] or [0])
+    slowest = sorted(((ms, name) for depth, name, ms in imports[begin:end] if depth == 1),
+                     reverse=True)
+    return {'module': module, 'wall_time': wall_time, 'import_ms': imports[end][2],
+            'slowest': [(name, ms) for ms, name in slowest[:top]]}
+
+def compare(results, baseline, thresholds=THRESHOLDS):
+    """
+    Compares results against a baseline
+    :return: list of regression messages (empty if none)
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            print("%s: no baseline" % name)
+            continue
+        for metric, threshold in sorted(thresholds.items()):
+            base = baseline[name][metric]
+            if base > 0 and result[metric] > base*(1. + threshold):
+                regressions.append("%s: %s %.4g vs baseline %.4g (+%.0f%%, threshold %.0f%%)" % (
+                    name, metric, result[metric], base, 100.*(result[metric]/base - 1.),
+                    100.*threshold))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--configs', nargs='+', default=sorted(CONFIGS), choices=sorted(CONFIGS))
+    parser.add_argument('--sizes', nargs='+', default=["%i,%i,%i" % s for s in SIZES],
+                        help='Nclimb,Ncruise,Nmission triples')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--output', help='JSON lines file to append the results to')
+    parser.add_argument('--scaling', action='store_true',
+                        help='fit the metrics against the mission discretization')
+    parser.add_argument('--climb', nargs='+', type=int, default=[2, 4, 8], help='Nclimb values')
+    parser.add_argument('--cruise', nargs='+', type=int, default=[2, 4, 8, 16],
+                        help='Ncruise values')
+    parser.add_argument('--missions', nargs='+', type=int, default=[1, 2], help='Nmission values')
+    parser.add_argument('--startup', nargs='*', metavar='MODULE',
+                        help='import time of the entry points (default: %s)'
+                        % ", ".join(ENTRY_POINTS))
+    args = parser.parse_args(argv)
+
+    if args.startup is not None:
+        failed = False
+        for module in args.startup or ENTRY_POINTS:
+            result = import_time(module)
+            if 'error' in result:
+                failed = True
+                print("%-16s import failed: %s" % (module, result['error']))
+                continue
+            print("%-16s import %8.1f ms  interpreter %8.1f ms" % (
+                module, result['import_ms'], 1e3*result['wall_time']))
+            for name, ms in result['slowest']:
+                print("    %-28s %8.1f ms" % (name, ms))
+        return 1 if failed else 0
+
+    if args.scaling:
+        sizes = [(Nclimb, Ncruise, Nmission) for Nmission in args.missions
+                 for Nclimb in args.climb for Ncruise in args.cruise]
+    else:
+        sizes = [tuple(int(n) for n in size.split(',')) for size in args.sizes]
+    cases = [(config,) + size for config in args.configs for size in sizes]
+    results = run_benchmark(cases)
+
+    if args.output:
+        with open(args.output, 'a') as f:
+            for name in sorted(results):
+                f.write(json.dumps(results[name], sort_keys=True) + '\n')
+
+    if args.scaling:
+        for config, fits in sorted(fit_scaling(results).items()):
+            print("%s scaling with N = (Nclimb + Ncruise)*Nmission:" % config)
+            for metric in SCALING_METRICS:
+                if metric in fits:
+                    print("    %-22s %10.4g * N**%.3f" % ((metric,) + fits[metric]))
+        return 0
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print("Saved baseline to %s" % args.baseline)
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except IOError:
+        print("No baseline found at %s; run with --save-baseline to create one" % args.baseline)
+        return 0
+    regressions = compare(results, baseline)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,25 +1,165 @@
+"""
+Launches the design server and serveCSM, and opens the ESP front end
+
+File events drive every step (requires watchdog, which uses inotify on
+Linux): serveCSM starts as soon as the server has written the baseline
+d82-0.csm, the browser opens once serveCSM has built its .egads and is
+listening, and serveCSM is restarted on every new .csm the server writes
+(pass --once to keep serving the first one).
+"""
 from __future__ import print_function
 import os
 import sys
+import socket
+import argparse
+import threading
 import webbrowser
-from subprocess import Popen, call
-from time import sleep
-
-
-def wait_until_file_exists(filename):
-    while not os.path.exists(filename):
-        sleep(1)
-    print("found", filename)
-
-
-try:
-    os.remove("d82-0.csm")
-    os.remove("d82_000.egads")
-except OSError:
-    pass
-Popen(["python", os.sep.join(["..","server.py"])])
-wait_until_file_exists("d82-0.csm")
-Popen(["serveCSM", "d82-0.csm"])
-wait_until_file_exists("d82_000.egads")
-sleep(5)
-webbrowser.open_new(os.sep.join(["..", "ESP", "ESP-localhost7681.html"]))
+from fnmatch import fnmatch
+from subprocess import Popen
+from time import time, sleep
+
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+ESP_DIR = os.path.join(ROOT, "ESP")
+ESP_PORT = 7681
+
+
+class FileWatcher(FileSystemEventHandler):
+    """
+    Calls callback(path) once each time a file matching pattern is written
+
+    A file counts as written when it is closed after writing (inotify) or
+    moved into place; other platforms only report modifications, so the
+    callback then runs once no event has arrived for settle seconds.
+
+    ARGUMENTS
+    ---------
+    pattern: filename pattern, e.g. 'd82-*.csm'
+    callback: function of the written file's path
+    settle: seconds to wait after the last modification when no close event comes
+    """
+
+    def __init__(self, pattern, callback, settle=0.25):
+        super(FileWatcher, self).__init__()
+        self.pattern = pattern
+        self.callback = callback
+        self.settle = settle
+        self._timers = {}
+        self._seen = {}
+        self._lock = threading.Lock()
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        path = getattr(event, "dest_path", "") or event.src_path
+        if not fnmatch(os.path.basename(path), self.pattern):
+            return
+        if event.event_type in ("closed", "moved"):
+            self._fire(path)
+        elif event.event_type in ("created", "modified"):
+            with self._lock:
+                if path in self._timers:
+                    self._timers[path].cancel()
+                self._timers[path] = threading.Timer(self.settle, self._fire, (path,))
+                self._timers[path].start()
+
+    def _fire(self, path):
+        with self._lock:
+            timer = self._timers.pop(path, None)
+            if timer is not None:
+                timer.cancel()
+            try:
+                stamp = os.stat(path).st_mtime
+            except OSError:
+                return
+            # a close event and the settle timer report the same write
+            if self._seen.get(path) == stamp:
+                return
+            self._seen[path] = stamp
+        self.callback(path)
+
+
+def wait_until_listening(port, timeout=30.):
+    "waits for a local port to accept connections; returns whether it did"
+    end = time() + timeout
+    while time() < end:
+        try:
+            socket.create_connection(("localhost", port), 0.1).close()
+            return True
+        except (socket.error, socket.timeout):
+            sleep(0.05)
+    return False
+
+
+class Orchestrator(object):
+    """
+    Runs the design server and serveCSM, reacting to the files they write
+
+    ARGUMENTS
+    ---------
+    retrigger: restart serveCSM on every new .csm, not only the first
+    """
+
+    def __init__(self, retrigger=True):
+        self.retrigger = retrigger
+        self.server = None
+        self.servecsm = None
+        self.browser_opened = False
+        self.observer = Observer()
+        self._lock = threading.Lock()
+
+    def start(self):
+        for stale in [os.path.join(ESP_DIR, "d82-0.csm"), os.path.join(ESP_DIR, "d82_000.egads")]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        self.observer.schedule(FileWatcher("d82-*.csm", self.csm_written), ESP_DIR)
+        self.observer.schedule(FileWatcher("*.egads", self.egads_written), ESP_DIR)
+        self.observer.start()
+        self.server = Popen([sys.executable, os.path.join(ROOT, "server.py")], cwd=ROOT)
+
+    def csm_written(self, path):
+        with self._lock:
+            if self.servecsm is not None:
+                if not self.retrigger:
+                    return
+                self.servecsm.terminate()
+                self.servecsm.wait()
+            print("serving", path)
+            self.servecsm = Popen(["serveCSM", path], cwd=ESP_DIR)
+
+    def egads_written(self, path):
+        print("found", path)
+        if self.browser_opened:
+            return
+        self.browser_opened = True
+        if not wait_until_listening(ESP_PORT):
+            print("serveCSM is not listening on port %i" % ESP_PORT)
+        webbrowser.open_new(os.path.join(ESP_DIR, "ESP-localhost7681.html"))
+
+    def run(self):
+        "starts everything and returns when the design server exits"
+        self.start()
+        try:
+            self.server.wait()
+        finally:
+            self.stop()
+
+    def stop(self):
+        self.observer.stop()
+        self.observer.join()
+        for process in [self.servecsm, self.server]:
+            if process is not None and process.poll() is None:
+                process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--once", action="store_true",
+                        help="serve only the first .csm instead of restarting serveCSM on new ones")
+    args = parser.parse_args()
+    Orchestrator(retrigger=not args.once).run()
@@ -0,0 +1,276 @@
+r"""
+Parametric D8 family: generated configurations and substitutions, solved in batch
+
+Every member is a D8 (double-bubble fuselage, pi-tail) of one size class,
+design Mach number and engine arrangement (rear engines with or without
+BLI, or wing engines). Its AircraftConfig and substitutions are generated
+from the D8 substitution layers of the same engine arrangement
+(subs.optimalD8, subs.D8_no_BLI, subs.D8_eng_wing) by the SIZE_CLASSES and
+MACH tables, which replace the near-duplicate files of subs/Legacy_subs.
+test_family.py checks every member against the substitutions recorded in
+family_subs.json.
+
+The members that had a Legacy_subs file reproduce it, except where the
+Legacy_subs files had fallen behind the maintained D8 layers or were wrong:
+  - C_{L_{w,max}} divides by cos(sweep)**2 with the sweep in radians; the
+    Legacy_subs files passed degrees to numpy's cos (e.g. 3.50 for 2.27 at
+    Mach 0.72).
+  - \dot{r}_{req}, V_{vt_{min}}, h_{f}, C_{p_{c}}, the no-BLI f_{pylon} and
+    the medium no-BLI r_{v_{nacelle}} are the maintained layers', not the
+    older values the Legacy_subs files copied (e.g. V_{vt_{min}} 0.001 for
+    0.03, 0.06 or 0.1, f_{pylon} 0.11 for 0.12).
+  - The medium members are the maintained layers themselves: the \Delta
+    x_{CG}, f_{L_{total/wing}}, f_{wingfuel}, \tau_{max_w} and pressure
+    ratios of D8_no_BLI_M08 and D8_eng_wing_M08 are not carried, nor the
+    Mach 0.80 \pi_{f_D} (1.7) and T_{t_{4.1_{max-Cruise}}} (1120 K) of D8_M08:
+    the design pressure ratios are per size class, and the cruise turbine
+    inlet temperature limit is the model's.
+  - The large BLI members use the large size class's BLI constants at
+    every Mach number; D8_big_M072 had the medium D_{reduct}, f_{BLI_{P}}
+    and f_{BLI_{V}}.
+  - \alpha_{max} (6.97 in D82) is only fixed with fixedBPR, see
+    subs.engine_options; members optimize the bypass ratio.
+  - f_{lgmain} and f_{lgnose} are not variables of the model.
+  - R_{req} and n_{pass} come from the size class; the Legacy_subs files
+    left them to the mission.
+
+Usage:
+    python family.py                       # solve the whole family on every core
+    python family.py --sizes large --mach 0.72 0.84 --workers 4
+    python family.py --fixed-pressure-ratios  # the size classes' pressure ratios
+    python family.py --list                # list the members without solving
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import sys
+import json
+import argparse
+from numpy import cos, tan, pi
+
+from gpkit import units
+from gpkit.small_scripts import mag
+
+from aircraft_config import AircraftConfig, register_generated
+from subs import get_subs
+
+# D8 substitution layer of each engine arrangement: (engine location, BLI)
+ENGINES = {
+    'BLI': ('rear', True, 'optimalD8'),
+    'no_BLI': ('rear', False, 'D8_no_BLI'),
+    'eng_wing': ('wing', False, 'D8_eng_wing'),
+}
+
+# Size classes: engine model, mission, BLI losses, engine station 4a Mach
+# number, wing engine location, and the substitutions that differ from the
+# 737-class D8 (from the small and 777-class D8s of Legacy_subs): those of
+# every member, those of one engine arrangement ('engines'), and the layers'
+# substitutions the size class leaves free ('free'). 'p_{BLI}'
+# holds the (static pressure [Pa], dynamic pressure / V**2 [kg/m^3]) of the
+# BLI stagnation pressure loss factor at cruise. The pressure ratios are the
+# design values used when they are not optimized (pRatOpt=False).
+SIZE_CLASSES = {
+    'small': {'eng': 3, 'R_{req}': 2000., 'n_{pass}': 100.,
+              'BLIVloss': 0.072712, 'wake_benefit': 0.08, 'p_{BLI}': (18753.9, .5*0.301559),
+              'M4a': .2, 'y_{eng}': 11.*units('ft'),
+              'substitutions': {
+                  'SPR': 6.,
+                  'W_{cargo}': 10000.*units('lbf'),
+                  '\\Delta x_{CG}': 6.8*units('ft'),
+                  'f_{L_{total/wing}}': 1.179,
+                  'f_{wingfuel}': 0.5,
+                  'l_{nose}': 18.*units('ft'),
+                  '\\pi_{f_D}': 1.5,
+                  '\\pi_{lc_D}': 4.,
+                  '\\pi_{hc_D}': 5.,
+              },
+              'engines': {
+                  'no_BLI': {'r_{v_{nacelle}}': 1.02},
+              },
+              'free': ()},
+    'medium': {'eng': 3, 'R_{req}': 3000., 'n_{pass}': 180.,
+               'BLIVloss': 0.072712, 'wake_benefit': 0.08, 'p_{BLI}': (18753.9, .5*0.301559),
+               'M4a': .2, 'y_{eng}': None,  # as in subs.D8_eng_wing
+               'substitutions': {}, 'engines': {}, 'free': ()},
+    'large': {'eng': 4, 'R_{req}': 6000., 'n_{pass}': 450.,
+              'BLIVloss': 0.088197, 'wake_benefit': 0.1, 'p_{BLI}': (10400., .2546*1.225),
+              'M4a': .1025, 'y_{eng}': 32.*units('ft'),
+              'substitutions': {
+                  'SPR': 12.,
+                  'W_{avg. pass_{total}}': 230.*units('lbf'),
+                  '\\Delta x_{CG}': 11.97*units('ft'),
+                  'x_{CG_{min}}': 117.31*units('ft'),
+                  '\\theta_{db}': 0.366,
+                  'l_{nose}': 50.75*units('ft'),
+                  'h_{floor}': 5.*units('in'),
+                  'b_{max}': 200.*units('ft'),
+                  '\\tau_{max_w}': 0.15,
+                  'f_{L_{total/wing}}': 1.179,
+                  'f_{fuel_{res}}': .05,
+                  'f_{lugg,2}': 0.4,
+                  'f_{slat}': 0.0001,
+                  'f_{wingfuel}': 0.5,
+                  'T_{t_{4.1_{max}}}': 1860.*units('K'),
+                  'M_{takeoff}': .9539,
+                  '\\alpha_c': .156,
+                  'C_{p_{t1}}': 1257.3,
+                  'C_{p_{t2}}': 1158.35,
+                  'C_{p_{c}}': 1278.5,
+                  '\\pi_{f_D}': 1.7,
+                  '\\pi_{lc_D}': 4.69,
+                  '\\pi_{hc_D}': 5.25,
+              },
+              'engines': {
+                  'eng_wing': {'f_{pylon}': 0.05},
+                  'no_BLI': {'r_{S_{nacelle}}': 12., 'r_{v_{nacelle}}': 1.02},
+              },
+              # the joining angle is fixed instead of the added half-width
+              'free': ('w_{db}',)},
+}
+
+# Design (minimum cruise) Mach numbers: wing, VT and HT sweeps [deg]
+MACH = {
+    0.72: (13.237, 25., 8.),
+    0.80: (26., 25., 25.),
+    0.84: (32.583, 28., 33.),
+}
+
+# Unswept maximum wing lift coefficient [TAS] and BLI parameters of the D8
+CLMAX = 2.15
+FBLI = 0.4
+WAKE_PERCENT = 0.33
+
+def member_name(size, M, engines):
+    return "D8_%s_M%03i_%s" % (size, round(100*M), engines)
+
+register_generated(r"D8_(%s)_M\d{3}_(%s)" % ("|".join(SIZE_CLASSES), "|".join(ENGINES)))
+
+def members(sizes=None, machs=None, engines=None):
+    """
+    Members of the family, one per size class x Mach number x engine arrangement
+    :return: list of (name, size class, Mach number, engine arrangement)
+    """
+    return [(member_name(size, M, eng), size, M, eng)
+            for size in (sizes or sorted(SIZE_CLASSES))
+            for M in (machs or sorted(MACH))
+            for eng in (engines or sorted(ENGINES))]
+
+def member_config(size, M, engines):
+    "AircraftConfig of a member"
+    location, BLI, _ = ENGINES[engines]
+    return AircraftConfig(member_name(size, M, engines), location, 'doublebubble', piHT=True,
+                          BLI=BLI, eng=SIZE_CLASSES[size]['eng'])
+
+def member_subs(size, M, engines):
+    """
+    Substitutions of a member: its engine arrangement's D8 layer, updated
+    with its size class and with the sweeps and BLI factors of its Mach number
+    """
+    location, BLI, layer = ENGINES[engines]
+    sizeclass = SIZE_CLASSES[size]
+    sweep, VTsweep, HTsweep = MACH[M]
+    BLIVloss = sizeclass['BLIVloss']
+    pBLI, qBLI = sizeclass['p_{BLI}']
+
+    substitutions = get_subs(layer)
+    for key in sizeclass['free']:
+        substitutions.pop(key, None)
+    substitutions.update(sizeclass['substitutions'])
+    substitutions.update(sizeclass['engines'].get(engines, {}))
+    substitutions.update({
+        'R_{req}': sizeclass['R_{req}']*units('nmi'),
+        'n_{pass}': sizeclass['n_{pass}'],
+        'M_{min}': M,
+        'hold_{4a}': 1.+.5*(1.313-1.)*sizeclass['M4a']**2.,
+
+        # Wing, VT and HT sweeps
+        'C_{L_{w,max}}': CLMAX/(cos(sweep*pi/180.)**2),
+        '\\tan(\\Lambda)': tan(sweep*pi/180.),
+        '\\cos(\\Lambda)': cos(sweep*pi/180.),
+        '\\tan(\\Lambda_{vt})': tan(VTsweep*pi/180.),
+        '\\cos(\\Lambda_{vt})^3': cos(VTsweep*pi/180.)**3,
+        '\\tan(\\Lambda_{ht})': tan(HTsweep*pi/180.),
+        '\\cos(\\Lambda_{ht})^3': cos(HTsweep*pi/180.)**3,
+    })
+    if BLI:
+        substitutions.update({
+            'D_{reduct}': 1-((1-FBLI)*sizeclass['wake_benefit']*WAKE_PERCENT),
+            # cruise stagnation pressure loss factor, given the min cruise
+            # mach number and the BLI velocity loss factor
+            'f_{BLI_{P}}': (pBLI + qBLI*((1-BLIVloss)*M*295.)**2)/(pBLI + qBLI*(M*295.)**2),
+            'f_{BLI_{V}}': 1 - BLIVloss,
+        })
+    if location == 'wing' and sizeclass['y_{eng}'] is not None:
+        substitutions['y_{eng}'] = sizeclass['y_{eng}']
+    return substitutions
+
+def member_case(size, M, engines, Nclimb=3, Ncruise=2, pRatOpt=True):
+    """
+    batch.solve_case specification of a member, minimizing fuel burn
+    :param pRatOpt: optimize the pressure ratios, or fix them to the size class's
+    """
+    return {'config': member_config(size, M, engines),
+            'base_substitutions': member_subs(size, M, engines),
+            'Nclimb': Nclimb, 'Ncruise': Ncruise,
+            'objective': 'W_{f_{total}}', 'fixedBPR': False, 'pRatOpt': pRatOpt}
+
+def solve_family(family, workers=None, Nclimb=3, Ncruise=2, pRatOpt=True):
+    """
+    Solves members of the family across worker processes
+    :param family: list of members (see members)
+    :param pRatOpt: optimize the pressure ratios (see member_case)
+    :return: list of solutions, None for the members that failed to solve
+    """
+    from batch import solve_cases
+    cases = [member_case(size, M, eng, Nclimb, Ncruise, pRatOpt) for _, size, M, eng in family]
+    return solve_cases(cases, workers, skip_failures=True)
+
+def summary(member, sol):
+    "JSON-able summary of a member's solution"
+    name, size, M, engines = member
+    result = {'name': name, 'size': size, 'M': M, 'engines': engines, 'solved': sol is not None}
+    if sol is not None:
+        for var, unit in [('W_{f_{total}}', 'lbf'), ('W_{total}', 'lbf'), ('W_{dry}', 'lbf')]:
+            result[var] = float(mag(sol(var).to(unit)).sum())
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--sizes', nargs='+', choices=sorted(SIZE_CLASSES))
+    parser.add_argument('--mach', nargs='+', type=float, help='design Mach numbers, of %s'
+                        % ", ".join("%.2f" % M for M in sorted(MACH)))
+    parser.add_argument('--engines', nargs='+', choices=sorted(ENGINES))
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--Nclimb', type=int, default=3)
+    parser.add_argument('--Ncruise', type=int, default=2)
+    parser.add_argument('--fixed-pressure-ratios', action='store_true',
+                        help="fix the pressure ratios to the size class's instead of optimizing them")
+    parser.add_argument('--output', help='JSON lines file to append the results to')
+    parser.add_argument('--list', action='store_true', help='only list the members')
+    args = parser.parse_args(argv)
+
+    for M in args.mach or []:
+        if M not in MACH:
+            parser.error("no sweeps for Mach %s" % M)
+    family = members(args.sizes, args.mach, args.engines)
+    if args.list:
+        for name, _, _, _ in family:
+            print(name)
+        return 0
+
+    sols = solve_family(family, args.workers, args.Nclimb, args.Ncruise,
+                        not args.fixed_pressure_ratios)
+    results = [summary(member, sol) for member, sol in zip(family, sols)]
+    for result in results:
+        if result['solved']:
+            print("%-26s W_f_total %10.0f lbf  W_total %10.0f lbf" % (
+                result['name'], result['W_{f_{total}}'], result['W_{total}']))
+        else:
+            print("%-26s failed" % result['name'])
+    if args.output:
+        with open(args.output, 'a') as f:
+            for result in results:
+                f.write(json.dumps(result, sort_keys=True) + '\n')
+    return 0 if all(result['solved'] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
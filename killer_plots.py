@@ -1,45 +1,33 @@
 from __future__ import absolute_import
 # only needed for plotting
 from builtins import range
-import matplotlib.pyplot as plt
 import numpy as np
 
-# Percent diffs
-from percent_diff import percent_diff
 from gpkit import units
 from gpkit.small_scripts import mag
 
-# Solution saving
-from saveSol import genSolOut
+# Batch solving
+from batch import solve_cases
 
-# Models and substitutions
-from aircraft import Mission
-from SPaircraft import optimize_aircraft
-from subs.optimalD8 import get_optimalD8_subs
-from subs.optimal737 import get_optimal737_subs
-from subs.M072_737 import get_M072_737_subs
-from subs.D8_no_BLI import get_D8_no_BLI_subs
-from subs.D8_eng_wing import get_D8_eng_wing_subs
-
-def standard_killer_plot():
+def standard_killer_plot(workers=None):
     """
     Generates the standard killer plots from the TASOPT paper
+    :param workers: number of worker processes to solve the design steps with
     """
+    import matplotlib.pyplot as plt
+
     Nclimb = 3; Ncruise = 2; Nmission = 1;
-    subsList = [get_optimal737_subs(), get_M072_737_subs(), get_D8_eng_wing_subs(), get_D8_no_BLI_subs(), get_optimalD8_subs(), get_optimalD8_subs()]
     configList = ['optimal737', 'M072_737', 'D8_eng_wing', 'D8_no_BLI', 'optimalD8', 'optimalD8']
     fixedBPRList = [True, True, True, True, True, False]
     pRatOptList = [False, False, False, False, False, True]
-    mutategpargList = [False, False, False, False, False, False]
-    sol = {}; wf = [];
-    for i in range(0,6):
-        m = Mission(Nclimb, Ncruise, configList[i], Nmission)
-        m.cost = m['W_{f_{total}}'].sum()
-        substitutions = subsList[i]
-        substitutions.update({'R_{req}': 3000.*units('nmi'),
-                              'n_{pass}': 180.})
-        sol[i] = optimize_aircraft(m, substitutions, fixedBPRList[i], pRatOptList[i], mutategpargList[i])
-        wf.append(sol[i]('W_{f_{total}}'))
+    cases = [{'config': configList[i],
+              'Nclimb': Nclimb, 'Ncruise': Ncruise, 'Nmission': Nmission,
+              'substitutions': {'R_{req}': 3000.*units('nmi'),
+                                'n_{pass}': 180.},
+              'fixedBPR': fixedBPRList[i],
+              'pRatOpt': pRatOptList[i]} for i in range(0,6)]
+    sol = solve_cases(cases, workers)
+    wf = [sol[i]('W_{f_{total}}') for i in range(0,6)]
 
     wing_sens = [sol[i]['sensitivities']['constants']['C_{wing}'] for i in range(0,6)]
     HT_sens = [sol[i]['sensitivities']['constants']['C_{ht}'] for i in range(0,6)]
@@ -0,0 +1,111 @@
+"""
+On-disk cache of constructed (un-substituted) Mission models
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import glob
+import hashlib
+import pickle
+
+import gpkit
+import turbofan
+
+from aircraft import Mission
+from aircraft_config import get_config
+
+# Source files whose contents determine the constructed Mission model
+MODEL_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_SOURCES = ['aircraft.py', 'aircraft_config.py', 'fuselage.py', 'wing.py', 'wingbox.py',
+                 'horizontal_tail.py', 'vertical_tail.py', 'landing_gear.py',
+                 'stand_alone_simple_profile.py']
+
+def source_hash():
+    """
+    Returns a hash of the model source files (including the turbofan package)
+    and of the gpkit version, used to invalidate stale cached models
+    """
+    files = [os.path.join(MODEL_DIR, f) for f in MODEL_SOURCES]
+    turbofan_dir = os.path.dirname(os.path.abspath(turbofan.__file__))
+    files += sorted(glob.glob(os.path.join(turbofan_dir, '*.py')))
+
+    h = hashlib.sha1(gpkit.__version__.encode())
+    for filename in files:
+        with open(filename, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:16]
+
+class MissionCache(object):
+    """
+    Loads prebuilt Mission models from disk, building and saving them on a miss
+
+    Models are keyed by (config, Nclimb, Ncruise, Nmission) and by the hash of
+    the model sources, so editing any submodel rebuilds the cached models.
+    Configurations are keyed by their name and the digest of their flags.
+    Every call returns a fresh copy, which the caller is free to modify.
+
+    ARGUMENTS
+    ---------
+    path: directory the pickled models are kept in
+    """
+
+    def __init__(self, path=os.path.join(MODEL_DIR, 'modelcache')):
+        self.path = path
+        self._hash = None
+
+    @property
+    def hash(self):
+        if self._hash is None:
+            self._hash = source_hash()
+        return self._hash
+
+    def _filename(self, Nclimb, Ncruise, config, Nmission):
+        config = get_config(config)
+        return os.path.join(self.path, "%s-%s_%i_%i_%i_%s.pkl" % (
+            config.name, config.digest(), Nclimb, Ncruise, Nmission, self.hash))
+
+    def get(self, Nclimb, Ncruise, config, Nmission=1):
+        """
+        Returns an un-substituted Mission model, loading it from disk if possible
+        Takes the same arguments as Mission.
+        """
+        filename = self._filename(Nclimb, Ncruise, config, Nmission)
+        try:
+            with open(filename, 'rb') as f:
+                return pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            pass
+
+        m = Mission(Nclimb, Ncruise, config, Nmission)
+        self._save(m, filename)
+        return m
+
+    def _save(self, m, filename):
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        # remove models of this key built from older sources
+        for stale in glob.glob(filename[:-len(self.hash)-4] + '*.pkl'):
+            if stale != filename:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+        tmpname = "%s.%i.tmp" % (filename, os.getpid())
+        try:
+            with open(tmpname, 'wb') as f:
+                pickle.dump(m, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, RuntimeError) as e:
+            # the model is still usable, it just won't be cached
+            print("Could not cache Mission model: %r" % e)
+            os.remove(tmpname)
+            return
+        os.replace(tmpname, filename)
+
+# Default cache, shared by the scripts and the design server
+MISSIONS = MissionCache()
+
+def load_mission(Nclimb, Ncruise, config, Nmission=1):
+    """
+    Returns an un-substituted Mission model from the default cache
+    """
+    return MISSIONS.get(Nclimb, Ncruise, config, Nmission)
@@ -2,60 +2,41 @@
 from __future__ import print_function
 from builtins import zip
 from builtins import range
+import os
+import sys
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
-from gpfit.fit import fit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from xfoil_polar_io import read_polar
+from polar_archive import load_archive
+from fit_cache import cached_fit
 plt.rcParams.update({'font.size':15})
 
-def text_to_df(filename):
-    "parse XFOIL polars and concatente data in DataFrame"
-    lines = list(open(filename))
-    for i, l in enumerate(lines):
-        lines[i] = l.split("\n")[0]
-        for j in 10-np.arange(9):
-            if " "*j in lines[i]:
-                lines[i] = lines[i].replace(" "*j, " ")
-            if "---" in lines[i]:
-                start = i
-    data = {}
-    titles = lines[start-1].split(" ")[1:]
-    for t in titles:
-        data[t] = []
-
-    for l in lines[start+1:]:
-        for i, v in enumerate(l.split(" ")[1:]):
-            data[titles[i]].append(v)
-
-    df = pd.DataFrame(data)
-    df = df.astype(float)
-    return df
-
 def fit_setup(naca_range, re_range, M_range):
     "set up x and y parameters for gp fitting"
     cd = []
     tau = []
     mach = []
     re = []
+    polars = load_archive()
     for m in M_range:
         for n in naca_range:
             for r in re_range:
-                dataf = text_to_df("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
-                if len(dataf["CD"]) != 0:
-                    cd.append(dataf["CD"])
-                    re.append(r)
-                    tau.append(float(n))
-                    mach.append(m)
+                dataf = polars.select("naca%s.cl0" % n, Re=r*1e3, M=m)
+                cd.append(dataf["CD"])
+                re.append([r]*len(dataf))
+                tau.append([float(n)]*len(dataf))
+                mach.append([m]*len(dataf))
 
     u1 = np.hstack(re)
     u2 = np.hstack(tau)
     print(u2)
     u3 = np.hstack(mach)
     w = np.hstack(cd)
-    u1 = u1.astype(np.float)
-    u2 = u2.astype(np.float)
-    u3 = u3.astype(np.float)
-    w = w.astype(np.float)
+    u1 = u1.astype(float)
+    u2 = u2.astype(float)
+    u3 = u3.astype(float)
+    w = w.astype(float)
     u = [u1, u2, u3]
     x = np.log(u)
     y = np.log(w)
@@ -86,7 +67,7 @@ def make_fit(naca_range, re_range, M_range):
     #call the fit setup function
     x, y = fit_setup(naca_range, re_range, M_range)
 
-    cstrt, rms = fit(x, y, 4, 'SMA')
+    cstrt, rms = cached_fit(x, y, 4, 'sma')
     print("RMS")
     print(rms)
 
@@ -105,7 +86,7 @@ def plot_fits(naca_range, re_range, M_range):
             delcount = 0
             for i in range(len(re_range)):
                 r = re_range[i]
-                dataf = text_to_df("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
+                dataf = read_polar("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
                 if len(dataf["CD"]) != 0:
                     cd.append(dataf["CD"])
                 else:
@@ -140,7 +121,7 @@ def plot_fits(naca_range, re_range, M_range):
             delcount = 0
             for i in range(len(re_range)):
                 r = re_range[i]
-                dataf = text_to_df("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
+                dataf = read_polar("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
                 if len(dataf["CD"]) != 0:
                     cd.append(dataf["CD"])
                 else:
@@ -176,7 +157,7 @@ def plot_data(naca_range, re_range, M_range):
             delcount = 0
             for i in range(len(re_range)):
                 r = re_range[i]
-                dataf = text_to_df("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
+                dataf = read_polar("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
                 if len(dataf["CD"]) != 0:
                     cd.append(dataf["CD"])
                 else:
@@ -207,7 +188,7 @@ def plot_data(naca_range, re_range, M_range):
             delcount = 0
             for i in range(len(re_range)):
                 r = re_range[i]
-                dataf = text_to_df("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
+                dataf = read_polar("naca%s.cl0.Re%dk.M%s.pol" % (n, r, m))
                 if len(dataf["CD"]) != 0:
                     cd.append(dataf["CD"])
                 else:
@@ -2,35 +2,16 @@
 from __future__ import print_function
 from builtins import zip
 from builtins import range
+import os
+import sys
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
-from gpfit.fit import fit
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from xfoil_polar_io import read_polar
+from polar_archive import load_archive
+from fit_cache import cached_fit
 plt.rcParams.update({'font.size':15})
 
-def text_to_df(filename):
-    "parse XFOIL polars and concatente data in DataFrame"
-    lines = list(open(filename))
-    for i, l in enumerate(lines):
-        lines[i] = l.split("\n")[0]
-        for j in 10-np.arange(9):
-            if " "*j in lines[i]:
-                lines[i] = lines[i].replace(" "*j, " ")
-            if "---" in lines[i]:
-                start = i
-    data = {}
-    titles = lines[start-1].split(" ")[1:]
-    for t in titles:
-        data[t] = []
-
-    for l in lines[start+1:]:
-        for i, v in enumerate(l.split(" ")[1:]):
-            data[titles[i]].append(v)
-
-    df = pd.DataFrame(data)
-    df = df.astype(float)
-    return df
-
 def fit_setup(thick_range, re_range, M_range):
     "set up x and y parameters for gp fitting"
     cd = []
@@ -38,17 +19,17 @@ def fit_setup(thick_range, re_range, M_range):
     mach = []
     re = []
     cl = []
+    polars = load_archive()
     for m in M_range:
         for n in thick_range:
             for r in re_range:
-                dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
-                for i in range(len(dataf["CD"])):
-                    if dataf["CD"][i] and dataf["CL"][i] != 0:
-                        cd.append(dataf["CD"][i])
-                        cl.append(dataf["CL"][i])
-                        re.append(r)
-                        tau.append(float(n)/1000)
-                        mach.append(m)
+                dataf = polars.select("blade.e%s" % n, Re=r*1e3, M=m)
+                dataf = dataf[(dataf["CD"] != 0) & (dataf["CL"] != 0)]
+                cd.append(dataf["CD"])
+                cl.append(dataf["CL"])
+                re.append([r]*len(dataf))
+                tau.append([float(n)/1000]*len(dataf))
+                mach.append([m]*len(dataf))
 
     u1 = np.hstack(re)
     print(u1)
@@ -57,10 +38,10 @@ def fit_setup(thick_range, re_range, M_range):
     u3 = np.hstack(mach)
     u4 = np.hstack(cl)
     w = np.hstack(cd)
-    u1 = u1.astype(np.float)
-    u2 = u2.astype(np.float)
-    u3 = u3.astype(np.float)
-    w = w.astype(np.float)
+    u1 = u1.astype(float)
+    u2 = u2.astype(float)
+    u3 = u3.astype(float)
+    w = w.astype(float)
     u = [u1, u2, u3, u4]
     x = np.log(u)
     y = np.log(w)
@@ -100,7 +81,7 @@ def make_fit(thick_range, re_range, M_range):
     #call the fit setup function
     x, y = fit_setup(thick_range, re_range, M_range)
 
-    cstrt, rms = fit(x, y, 3, 'SMA')
+    cstrt, rms = cached_fit(x, y, 3, 'sma')
     print("RMS")
     print(rms)
 
@@ -117,7 +98,7 @@ def plot_fits(thick_range, re_range, M_range, cl_range):
 ##                cl = []
 ##                
 ##                r = re_range[i]
-##                dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+##                dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
 ##                if len(dataf["CL"]) != 0:
 ##                    cd.append(dataf["CD"])
 ##                    cl.append(dataf["CL"])
@@ -138,7 +119,7 @@ def plot_fits(thick_range, re_range, M_range, cl_range):
 ##                cl = []
 ##                
 ##                r = re_range[i]
-##                dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+##                dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
 ##                if len(dataf["CL"]) != 0:
 ##                    cd.append(dataf["CD"])
 ##                    cl.append(dataf["CL"])
@@ -160,7 +141,7 @@ def plot_fits(thick_range, re_range, M_range, cl_range):
 ##                m_vec = []
 ##                cl = []
 ##                for m in M_range:
-##                    dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+##                    dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
 ##                    for j in range(len(dataf["CL"])):
 ##                        if dataf["CL"][j] <= cl_range[i]+0.01 and dataf["CL"][j] >= cl_range[i]-0.01:
 ##                            cd.append(dataf["CD"][j])
@@ -189,7 +170,7 @@ def plot_fits(thick_range, re_range, M_range, cl_range):
                 w = []
                 for m in M_range:
                     ms = res = np.linspace(M_range[0], M_range[-1], len(res))
-                    dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+                    dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
                     for j in range(len(dataf["CL"])):
                         if dataf["CL"][j] <= cl_range[i]+0.01 and dataf["CL"][j] >= cl_range[i]-0.01:
                             cd.append(dataf["CD"][j])
@@ -221,7 +202,7 @@ def plot_fits(thick_range, re_range, M_range, cl_range):
 ##                cl = []
 ##                re_plot = []
 ##                for r in re_range:
-##                    dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+##                    dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
 ##                    for j in range(len(dataf["CL"])):
 ##                        if dataf["CL"][j] <= cl_range[i]+0.01 and dataf["CL"][j] >= cl_range[i]-0.01:
 ##                            cd.append(dataf["CD"][j])
@@ -249,7 +230,7 @@ def plot_data(thick_range, re_range, M_range, cl_range):
                 cl = []
                 
                 r = re_range[i]
-                dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+                dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
                 if len(dataf["CL"]) != 0:
                     cd.append(dataf["CD"])
                     cl.append(dataf["CL"])
@@ -270,7 +251,7 @@ def plot_data(thick_range, re_range, M_range, cl_range):
                 cl = []
                 
                 r = re_range[i]
-                dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+                dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
                 if len(dataf["CL"]) != 0:
                     cd.append(dataf["CD"])
                     cl.append(dataf["CL"])
@@ -292,7 +273,7 @@ def plot_data(thick_range, re_range, M_range, cl_range):
                 m_vec = []
                 cl = []
                 for m in M_range:
-                    dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+                    dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
                     for j in range(len(dataf["CL"])):
                         if dataf["CL"][j] <= cl_range[i]+0.01 and dataf["CL"][j] >= cl_range[i]-0.01:
                             cd.append(dataf["CD"][j])
@@ -316,7 +297,7 @@ def plot_data(thick_range, re_range, M_range, cl_range):
                     m_vec = []
                     cl = []
                     for m in M_range:
-                        dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+                        dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
                         for j in range(len(dataf["CL"])):
                             if dataf["CL"][j] <= cl_range[i]+0.01 and dataf["CL"][j] >= cl_range[i]-0.01:
                                 cd.append(dataf["CD"][j])
@@ -343,7 +324,7 @@ def plot_data(thick_range, re_range, M_range, cl_range):
                 cl = []
                 re_plot = []
                 for r in re_range:
-                    dataf = text_to_df("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
+                    dataf = read_polar("blade.e%s.Re%dk.M%s.pol" % (n, r, m))
                     for j in range(len(dataf["CL"])):
                         if dataf["CL"][j] <= cl_range[i]+0.01 and dataf["CL"][j] >= cl_range[i]-0.01:
                             cd.append(dataf["CD"][j])
@@ -3,7 +3,7 @@ import numpy as np
 from numpy import logspace, log, log10
 import matplotlib.pyplot as plt
 # you have to change it to this and run the file form gpfit
-from gpfit.fit import fit
+from fit_cache import cached_fit
 
 # Fitting for y = (1+lam+lam^2)/(1+lam)
 lambdas = np.linspace(0.1,0.35,20)
@@ -15,9 +15,9 @@ y_max = np.amax(y)
 pmax = np.amax(p)
 logy = log(y/y_max)
 logp = log(p/pmax)
-Type = 'SMA'
+Type = 'sma'
 K = 2
-cstrt,rms_error = fit(logp[1:-2],logy[1:-2],K,Type)
+cstrt,rms_error = cached_fit(logp[1:-2],logy[1:-2],K,Type)
 
 
 geny = (0.205*(p/pmax)**0.772 + 0.795*(p/pmax)**-0.125)**(1/.166)*y_max
@@ -0,0 +1,121 @@
+"""
+On-disk cache of gpfit fits, keyed by a hash of their data and settings
+
+Targets gpfit 0.2, whose fit returns a Fit object: the cache turns it into
+a constraint on the variables w and u_1, ..., u_d (the form the fitting
+scripts print and fit_search reads) and its relative RMS error. The
+gpfit version is part of the cache key, so upgrading gpfit refits.
+
+Usage:
+    from fit_cache import cached_fit
+    cstrt, rms = cached_fit(x, y, 4, 'sma')     # fit types of gpfit.fit.fit
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import hashlib
+import pickle
+import numpy as np
+
+import gpfit
+from gpfit.fit import fit
+from gpkit import Variable
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(HERE, 'fitcache')
+GPFIT_VERSION = str(getattr(gpfit, '__version__', ''))
+
+# fit types of gpfit.fit.fit; the old gpfit's upper case names are accepted too
+FIT_TYPES = ("ma", "sma", "isma")
+
+def fit_constraint(f):
+    """
+    Returns the constraint of a gpfit Fit on the variables w and u_1, ..., u_d
+    (gpfit's own constraint_set adds a margin variable, and fails for ISMA fits)
+    :raises ValueError: if the fit's monomials cannot be represented
+    """
+    K, d = f.K, f.d
+    if f.type == "ImplicitSoftmaxAffine":
+        # gpfit 0.2 evaluates ISMA fits with the softness parameters at the
+        # end of params, but reports their inverses in f.parameters
+        alpha = f.params[-K:]
+        ba = f.params[:-K].reshape(K, d + 1)
+        c = np.exp(alpha*ba[:, 0])
+        e = alpha[:, None]*ba[:, 1:]
+    else:
+        p = f.parameters
+        c = np.array([p["c%i" % k] for k in range(K)])
+        e = np.array([[p["e%i%i" % (k, i)] for i in range(d)] for k in range(K)])
+    if not (np.all(np.isfinite(c)) and np.all(c > 0) and np.all(np.isfinite(e))):
+        # e.g. ISMA softnesses so large that the coefficients underflow
+        raise ValueError("gpfit returned a degenerate %s fit, with coefficients %s"
+                         % (f.type, c))
+
+    w = Variable("w")
+    u = [Variable("u_%i" % (i + 1)) for i in range(d)]
+    monomials = []
+    for k in range(K):
+        monomial = c[k]
+        for i, ui in enumerate(u):
+            monomial = monomial*ui**e[k, i]
+        monomials.append(monomial)
+    if f.type == "MaxAffine":
+        # w >= each monomial
+        return [w >= monomial for monomial in monomials]
+    if f.type == "SoftmaxAffine":
+        # w**alpha >= sum of the monomials
+        return w**f.parameters["a1"] >= sum(monomials[1:], monomials[0])
+    # ImplicitSoftmaxAffine: 1 >= sum of monomial_k * w**-alpha_k
+    return 1 >= sum(monomial*w**-alpha[k] for k, monomial in enumerate(monomials))
+
+def fit_key(xdata, ydata, K, ftype, **kwargs):
+    """
+    Returns a hash of the fitted data, the fit type and term count, any
+    other fit arguments and the gpfit version
+    """
+    h = hashlib.sha1(GPFIT_VERSION.encode())
+    for data in [xdata, ydata]:
+        data = np.ascontiguousarray(data, dtype=float)
+        h.update(str(data.shape).encode())
+        h.update(data.tobytes())
+    h.update(repr((int(K), str(ftype), sorted(kwargs.items()))).encode())
+    return h.hexdigest()
+
+def cached_fit(xdata, ydata, K, ftype="isma", path=CACHE_DIR, **kwargs):
+    """
+    Fits like gpfit.fit.fit, reusing the result of an identical earlier fit
+    :param ftype: one of FIT_TYPES
+    :param path: directory the fits are kept in
+    :return: (constraint (see fit_constraint), relative RMS error)
+    :raises ValueError: for unknown fit types and degenerate fits
+    """
+    ftype = ftype.lower()
+    if ftype not in FIT_TYPES:
+        raise ValueError("unknown fit type %r, expected one of %s" % (ftype, ", ".join(FIT_TYPES)))
+    xdata = np.asarray(xdata, dtype=float)
+    ydata = np.asarray(ydata, dtype=float)
+    filename = os.path.join(path, "%s_K%i_gpfit%s_%s.pkl" % (
+        ftype, K, GPFIT_VERSION, fit_key(xdata, ydata, K, ftype, **kwargs)))
+    try:
+        with open(filename, 'rb') as f:
+            cached = pickle.load(f)
+        return cached['constraint'], cached['rms']
+    except (IOError, OSError, EOFError, KeyError, pickle.UnpicklingError):
+        pass
+
+    result = fit(xdata, ydata, K, ftype, **kwargs)
+    cstrt, rms = fit_constraint(result), float(result.error)
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    tmpname = "%s.%i.tmp" % (filename, os.getpid())
+    try:
+        with open(tmpname, 'wb') as f:
+            pickle.dump({'constraint': cstrt, 'rms': rms, 'text': str(cstrt)}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError, RuntimeError) as e:
+        # the fit is still usable, it just won't be cached
+        print("Could not cache fit: %r" % e)
+        os.remove(tmpname)
+        return cstrt, rms
+    os.replace(tmpname, filename)
+    return cstrt, rms
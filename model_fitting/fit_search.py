@@ -0,0 +1,252 @@
+"""
+Cross-validated search over gpfit fit types and term counts
+
+Every (fit type, K) pair of the grid is fitted on k-1 folds of the data and
+scored on the held-out fold, with all the fits run on a process pool.
+The report lists the cross-validated RMS and maximum relative error of w
+and the number of monomial terms of each fit (which sets the size of the
+signomial program). The pair picked is the one with the fewest terms whose
+cross-validated RMS is within --tolerance of the best; it is refitted on all
+the data and printed as a constraint ready to paste into the model.
+
+Usage:
+    python fit_search.py c_series
+    python fit_search.py tasopt_tail --types sma isma --K 2 3 4 5 --folds 5
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import re
+import sys
+import argparse
+import importlib.util
+from multiprocessing import Pool, cpu_count
+import numpy as np
+
+from fit_cache import cached_fit, FIT_TYPES
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# script with the dataset's fit_setup, its arguments, and the names of w and
+# of each u in the model, for the pasted constraint. The names scale the
+# model's variables to the fit_setup's inputs: Reynolds numbers in thousands,
+# and tail thicknesses as in the polar names (t/c x 1000 for the TASOPT
+# blades, x 100 for the NACA 00xx sections).
+DATASETS = {
+    'c_series': {'script': os.path.join("Wing_Fits", "TASOPT_c_series_airfoil_fits.py"),
+                 'args': (["100", "110", "120", "130", "140", "145"],
+                          list(range(10000, 35000, 5000)), [0.4, 0.5, 0.6, 0.7, 0.8, 0.9]),
+                 'names': ["CDp", "(Re/1000)", "(self.wing['\\\\tau'])",
+                           "(self.wing['\\\\cos(\\\\Lambda)']*state['M'])", "CLw"]},
+    'e_series': {'script': os.path.join("Wing_Fits", "TASOPT_e_series_airfoil_fits.py"),
+                 'args': (["100", "110", "120", "130", "140", "145"],
+                          list(range(10000, 35000, 5000)), [0.4, 0.5, 0.6, 0.7, 0.8, 0.9]),
+                 'names': ["CDp", "(Re/1000)", "(self.wing['\\\\tau'])",
+                           "(self.wing['\\\\cos(\\\\Lambda)']*state['M'])", "CLw"]},
+    'tasopt_tail': {'script': os.path.join("Tail Fits", "tasopt_tail_cl0_fits.py"),
+                    'args': (["100", "120", "140"], list(range(500, 9500, 500)), [0.4, 0.6, 0.8]),
+                    'names': ["CD0h", "(Rec/1000)", "(self.HT['\\\\tau_{ht}']*1000)",
+                              "(state['M'])"]},
+    'naca_tail': {'script': os.path.join("Tail Fits", "naca_cl0_fits.py"),
+                  'args': (["0008", "0009", "0010", "0015", "0020"],
+                           list(range(500, 9500, 500)), [0.4, 0.6, 0.8]),
+                  'names': ["CD0h", "(Rec/1000)", "(self.HT['\\\\tau_{ht}']*100)",
+                            "(state['M'])"]},
+}
+
+def load_dataset(name):
+    "(x, y) of a dataset, from the fit_setup of its fitting script"
+    options = DATASETS[name]
+    filename = os.path.join(HERE, options['script'])
+    spec = importlib.util.spec_from_file_location("fits_" + name, filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.fit_setup(*options['args'])
+
+def posynomials(cstrt):
+    "(exponents, coefficients) of the posynomials p <= 1 making up a fitted constraint"
+    if hasattr(cstrt, "as_posyslt1"):
+        return [(p.exps, p.cs) for p in cstrt.as_posyslt1()]
+    if hasattr(cstrt, "as_hmapslt1"):  # newer gpkit
+        return [(list(h.keys()), list(h.values())) for h in cstrt.as_hmapslt1({})]
+    return [p for c in cstrt for p in posynomials(c)]
+
+def input_order(varkey):
+    "sorts the fit inputs u_1, u_2, ... (scalar or vector variables) numerically"
+    index = getattr(varkey, "idx", None)
+    if index:
+        return (varkey.name, index)
+    match = re.search(r"(\d+)$", varkey.name)
+    return (varkey.name[:match.start()] if match else varkey.name,
+            (int(match.group(1)),) if match else ())
+
+def terms(cstrt, d):
+    """
+    Exponents and log coefficients of each posynomial of a fitted constraint
+    :param d: number of inputs
+    :return: list of (log c, input exponents [terms x d], w exponents) per posynomial
+    """
+    posys = posynomials(cstrt)
+    varkeys = set(vk for exps, _ in posys for exp in exps for vk in exp)
+    w = [vk for vk in varkeys if vk.name == "w"]
+    if len(w) != 1:
+        raise ValueError("could not find the fit's w variable in %s" % cstrt)
+    inputs = sorted((vk for vk in varkeys if vk != w[0]), key=input_order)
+    if len(inputs) > d:
+        raise ValueError("fit has %i inputs for %i-dimensional data" % (len(inputs), d))
+    out = []
+    for exps, cs in posys:
+        A = np.array([[exp.get(vk, 0.) for vk in inputs] + [0.]*(d - len(inputs))
+                      for exp in exps])
+        out.append((np.log(np.array(cs, dtype=float)), A,
+                    np.array([exp.get(w[0], 0.) for exp in exps])))
+    return out
+
+def predict(cstrt, x, iterations=60):
+    """
+    Evaluates a fit: the smallest w satisfying the constraint at each point
+    :param x: log of the inputs, of shape [d, n] (or [n] for one input)
+    :return: log w at each point
+    """
+    x = np.atleast_2d(x)
+    posys = terms(cstrt, x.shape[0])
+
+    def residual(logw):
+        "largest log p over the posynomials; decreasing in w"
+        worst = -np.inf
+        for logc, A, b in posys:
+            logp = logc[:, None] + A.dot(x) + b[:, None]*logw[None, :]
+            top = logp.max(axis=0)
+            worst = np.maximum(worst, top + np.log(np.exp(logp - top).sum(axis=0)))
+        return worst
+
+    lo = np.full(x.shape[1], -50.)
+    hi = np.full(x.shape[1], 50.)
+    for _ in range(iterations):
+        mid = (lo + hi)/2.
+        feasible = residual(mid) <= 0
+        hi = np.where(feasible, mid, hi)
+        lo = np.where(feasible, lo, mid)
+    return hi
+
+def n_terms(cstrt):
+    "number of monomial terms of a fitted constraint"
+    return sum(len(exps) for exps, _ in posynomials(cstrt))
+
+def folds(n, k, seed=0):
+    "index arrays of k random folds of n points"
+    return np.array_split(np.random.RandomState(seed).permutation(n), k)
+
+def run_fit(task):
+    """
+    Fits one fold (or all the data if test is None), in a worker process
+    :return: (ftype, K, fold, constraint, training RMS, held-out relative errors);
+             a degenerate fit has no constraint and infinite errors
+    """
+    x, y, ftype, K, fold, test, seed = task
+    x2 = np.atleast_2d(x)
+    train = np.ones(len(y), bool)
+    if test is not None:
+        train[test] = False
+    xtrain = x2[:, train] if np.ndim(x) > 1 else x[train]
+    try:
+        cstrt, rms = cached_fit(xtrain, y[train], K, ftype, seed=seed)
+    except ValueError:
+        return ftype, K, fold, None, np.inf, None if test is None else np.full(len(test), np.inf)
+    errors = None
+    if test is not None:
+        errors = np.exp(predict(cstrt, x2[:, test]) - y[test]) - 1.
+    return ftype, K, fold, cstrt, rms, errors
+
+def search(x, y, types=FIT_TYPES, Ks=(2, 3, 4, 5), k=5, workers=None, seed=0):
+    """
+    Cross-validates every fit type and K
+    :param seed: seed of the folds and of gpfit's initial parameters
+    :return: list of result dictionaries, one per (fit type, K); the
+             constraint of a fit type and K that failed on all the data is None
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    tasks = [(x, y, ftype, K, i, test, seed) for ftype in types for K in Ks
+             for i, test in enumerate(folds(len(y), k, seed))]
+    tasks += [(x, y, ftype, K, None, None, seed) for ftype in types for K in Ks]
+    pool = Pool(workers or cpu_count())
+    try:
+        fits = pool.map(run_fit, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    results = []
+    for ftype in types:
+        for K in Ks:
+            mine = [f for f in fits if f[0] == ftype and f[1] == K]
+            errors = np.hstack([f[5] for f in mine if f[2] is not None])
+            full = [f for f in mine if f[2] is None][0]
+            failed = full[3] is None
+            results.append({'ftype': ftype, 'K': K, 'constraint': full[3],
+                            'rms': full[4], 'terms': None if failed else n_terms(full[3]),
+                            'cv_rms': np.inf if failed else np.sqrt(np.mean(errors**2)),
+                            'cv_max': np.inf if failed else np.abs(errors).max()})
+    return results
+
+def choose(results, tolerance=0.05):
+    "the fit with the fewest terms whose cross-validated RMS is near the best"
+    results = [r for r in results if np.isfinite(r['cv_rms'])]
+    if not results:
+        raise ValueError("every fit failed")
+    best = min(r['cv_rms'] for r in results)
+    return min((r for r in results if r['cv_rms'] <= best*(1. + tolerance)),
+               key=lambda r: (r['terms'], r['cv_rms']))
+
+def format_constraint(cstrt, names, d):
+    """
+    Writes a fitted constraint as model code, one line per posynomial
+    :param names: model expressions of w and of each input u
+    """
+    lines = []
+    for logc, A, b in terms(cstrt, d):
+        monomials = []
+        for c, exps, bw in zip(np.exp(logc), A, b):
+            factors = ["%g" % c] + ["%s**%g" % (name, e) for name, e in zip(names[1:], exps) if e]
+            monomials.append((" * ".join(factors), bw))
+        if len(set(bw for _, bw in monomials)) == 1:
+            # w**a >= posynomial of the inputs
+            exponent = -monomials[0][1]
+            left = names[0] if exponent == 1 else "%s**%g" % (names[0], exponent)
+            lines.append("%s >= %s" % (left, "\n    + ".join(m for m, _ in monomials)))
+        else:
+            lines.append("1 >= %s" % "\n    + ".join(
+                "%s * %s**%g" % (m, names[0], bw) for m, bw in monomials))
+    return ",\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('dataset', choices=sorted(DATASETS))
+    parser.add_argument('--types', nargs='+', default=list(FIT_TYPES))
+    parser.add_argument('--K', nargs='+', type=int, default=[2, 3, 4, 5])
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--tolerance', type=float, default=0.05,
+                        help='relative cross-validated RMS allowed to save terms')
+    parser.add_argument('--names', nargs='+', help='model expressions of w and each input')
+    args = parser.parse_args(argv)
+
+    x, y = load_dataset(args.dataset)
+    results = search(x, y, args.types, args.K, args.folds, args.workers)
+    print("%-5s %3s %6s %10s %10s %10s" % ("type", "K", "terms", "fit RMS", "CV RMS", "CV max"))
+    for r in results:
+        if r['constraint'] is None:
+            print("%-5s %3i %6s %10s" % (r['ftype'], r['K'], "-", "failed"))
+            continue
+        print("%-5s %3i %6i %10.4g %10.4g %10.4g" % (r['ftype'], r['K'], r['terms'],
+                                                    r['rms'], r['cv_rms'], r['cv_max']))
+    chosen = choose(results, args.tolerance)
+    names = args.names or DATASETS[args.dataset]['names']
+    print("\nChosen: %s with K = %i (%i terms, CV RMS %.4g)\n" % (
+        chosen['ftype'], chosen['K'], chosen['terms'], chosen['cv_rms']))
+    print(format_constraint(chosen['constraint'], names, np.atleast_2d(x).shape[0]))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
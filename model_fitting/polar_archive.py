@@ -0,0 +1,96 @@
+"""
+Columnar archive of the XFOIL polars used by the fitting scripts
+
+Every .pol file in SOURCES is parsed once into a single numpy structured
+array (one row per polar point) saved as polars.npy. Rows are sorted by
+airfoil, Mach and Reynolds number, so each airfoil's polars are a
+contiguous slice of the memory-mapped file. The archive is rebuilt
+whenever a polar is newer than it.
+
+Usage:
+    python polar_archive.py         # (re)build polars.npy
+
+    from polar_archive import load_archive
+    polars = load_archive()
+    cd = polars.select("blade.c120", Re=20e6, M=0.6)["CD"]
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import glob
+import numpy as np
+
+from xfoil_polar_io import read_polar_dir
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCES = [os.path.join(HERE, "Tail Fits"), os.path.join(HERE, "Wing_Fits")]
+ARCHIVE = os.path.join(HERE, "polars.npy")
+
+def polar_files(sources=SOURCES):
+    return sorted(filename for source in sources
+                  for filename in glob.glob(os.path.join(source, "*.pol")))
+
+def build_archive(sources=SOURCES, filename=ARCHIVE):
+    """
+    Parses every polar of sources into the archive file
+    :return: number of rows archived
+    """
+    rows = np.concatenate([read_polar_dir(source) for source in sources])
+    rows.sort(order=["airfoil", "M", "Re", "alpha"])
+    tmpfile = filename + ".tmp.npy"
+    np.save(tmpfile, rows)
+    os.replace(tmpfile, filename)
+    return len(rows)
+
+def is_stale(sources=SOURCES, filename=ARCHIVE):
+    "whether the archive is missing or older than one of its polars"
+    if not os.path.exists(filename):
+        return True
+    built = os.path.getmtime(filename)
+    return any(os.path.getmtime(source) > built for source in sources) or \
+        any(os.path.getmtime(name) > built for name in polar_files(sources))
+
+def load_archive(sources=SOURCES, filename=ARCHIVE):
+    "returns the PolarArchive, building it first if it is stale"
+    if is_stale(sources, filename):
+        print("Archiving XFOIL polars to %s" % filename)
+        build_archive(sources, filename)
+    return PolarArchive(np.load(filename, mmap_mode="r"))
+
+class PolarArchive(object):
+    """
+    Queries of the archived polars
+
+    ARGUMENTS
+    ---------
+    rows: array of xfoil_polar_io.DTYPE sorted by airfoil, e.g. the memory-mapped archive
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def airfoils(self):
+        return sorted(set(self.rows["airfoil"].tolist()))
+
+    def select(self, airfoil, Re=None, M=None):
+        """
+        Returns the rows of an airfoil's polars, optionally at one Re and Mach
+        :param airfoil: airfoil name, e.g. 'blade.t100.cl0' or 'naca0008.cl0'
+        :param Re: Reynolds number (not in thousands, unlike the file names)
+        :param M: Mach number
+        """
+        names = self.rows["airfoil"]
+        rows = self.rows[np.searchsorted(names, airfoil, "left"):
+                         np.searchsorted(names, airfoil, "right")]
+        mask = np.ones(len(rows), bool)
+        if Re is not None:
+            mask &= np.isclose(rows["Re"], Re)
+        if M is not None:
+            mask &= np.isclose(rows["M"], M)
+        return rows[mask]
+
+if __name__ == "__main__":
+    print("Archived %i polar points to %s" % (build_archive(), ARCHIVE))
@@ -0,0 +1,66 @@
+"""
+Checks that the constraints fit_search pastes into the model evaluate the
+fit at the inputs its fit_setup fitted: the DATASETS names have to scale the
+model's variables the way the fitting script scaled the polar data. Also
+runs the whole search, with the installed gpfit, on a small synthetic dataset.
+
+Usage:
+    python -m pytest test_fit_search.py
+"""
+from __future__ import absolute_import
+import numpy as np
+import pytest
+from gpkit import Variable
+
+from fit_search import DATASETS, format_constraint, predict, search, choose
+
+class Model(object):
+    "stand-in for the model's self, with the HT variables the names read"
+    def __init__(self, tau):
+        self.HT = {'\\tau_{ht}': tau}
+
+def fitted_constraint():
+    "a 3-input fit of the form gpfit returns, in the fit's own u"
+    w = Variable("w")
+    u1, u2, u3 = Variable("u_1"), Variable("u_2"), Variable("u_3")
+    return w**2 >= 3e-4*u1**0.5*u2**-1.2*u3**2 + 2e-3*u1**-0.8*u2**0.6*u3**0.3
+
+# (dataset, thickness as named in the polars, its t/c, Reynolds number, Mach number)
+CASES = [
+    ('tasopt_tail', "120", 0.12, 3.5e6, 0.6),
+    ('tasopt_tail', "100", 0.10, 800e3, 0.4),
+    ('naca_tail', "0010", 0.10, 3.5e6, 0.6),
+    ('naca_tail', "0015", 0.15, 5e6, 0.8),
+]
+
+@pytest.mark.parametrize("dataset, thickness, tau, Re, M", CASES)
+def test_tail_names_match_fit_setup(dataset, thickness, tau, Re, M):
+    options = DATASETS[dataset]
+    assert thickness in options['args'][0]
+    # fit_setup: u1 = Re in thousands (the polars are at Re = u1*1e3),
+    # u2 = float(thickness name), u3 = M
+    u = np.array([Re/1e3, float(thickness), M])
+    cstrt = fitted_constraint()
+    expected = np.exp(predict(cstrt, np.log(u)[:, None]))[0]
+
+    code = format_constraint(cstrt, options['names'], 3)
+    left, right = code.split(">=")
+    assert left.strip() == "%s**2" % options['names'][0]
+    # pasted inside the model's constraint list, so continued lines are fine
+    rhs = eval("(%s)" % right, {}, {'Rec': Re, 'self': Model(tau), 'state': {'M': M}})
+    assert rhs**0.5 == pytest.approx(expected, rel=1e-6)
+
+def test_search_end_to_end():
+    rng = np.random.RandomState(0)
+    u = rng.uniform(1., 3., (2, 60))
+    w = u[0]**0.8 + 0.3*u[1]**-0.5
+    x, y = np.log(u), np.log(w)
+
+    results = search(x, y, Ks=(2, 3), k=3, workers=2)
+    assert len(results) == 3*2
+    chosen = choose(results)
+    assert chosen['cv_rms'] < 0.02
+
+    assert np.exp(predict(chosen['constraint'], x)) == pytest.approx(w, rel=0.05)
+    code = format_constraint(chosen['constraint'], ["w", "(u1)", "(u2)"], 2)
+    compile("[%s]" % code, "<pasted constraint>", "eval")
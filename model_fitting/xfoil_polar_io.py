@@ -0,0 +1,81 @@
+"""
+Reader of XFOIL polar files shared by the fitting scripts
+
+Polars are returned as numpy structured arrays of DTYPE, one row per
+polar point, so rows index like the DataFrames the scripts used before:
+polar["CD"], polar["CL"][i], len(polar). The numbers of all the tables
+read in one call are converted by a single vectorized load.
+
+Usage:
+    from xfoil_polar_io import read_polar, read_polar_dir
+    polar = read_polar("blade.c120.Re20000k.M0.6.pol")
+    rows = read_polar_dir("Wing_Fits")   # every polar of a directory
+"""
+from __future__ import absolute_import
+import os
+import re
+import glob
+import numpy as np
+
+COLUMNS = ["alpha", "CL", "CD", "CDp", "CM", "Top_Xtr", "Bot_Xtr"]
+DTYPE = np.dtype([("airfoil", "U24"), ("Re", "f8"), ("M", "f8"), ("Ncrit", "f8")]
+                 + [(name, "f8") for name in COLUMNS])
+
+HEADER = re.compile(r"Mach\s*=\s*([\d.]+)\s+Re\s*=\s*([\d.]+)\s*e\s*(\d+)\s+Ncrit\s*=\s*([\d.]+)")
+RULE = re.compile(r"^\s*-{6}[- ]*$", re.M)
+
+def airfoil_name(filename):
+    "airfoil of a polar file, e.g. blade.t100.cl0 for blade.t100.cl0.Re500k.M0.4.pol"
+    return os.path.basename(filename).split(".Re")[0]
+
+def split_polar(text, filename):
+    """
+    Splits the contents of a polar file
+    :return: (Mach, Re, Ncrit, column titles, table text)
+    """
+    rule = RULE.search(text)
+    header = HEADER.search(text, 0, rule.start() if rule else 0)
+    if not rule or not header:
+        raise ValueError("%s is not an XFOIL polar" % filename)
+    titles = text[:rule.start()].split("\n")[-2].split()
+    M, Re, exponent, Ncrit = header.groups()
+    return float(M), float(Re)*10**int(exponent), float(Ncrit), titles, text[rule.end():]
+
+def read_polars(filenames):
+    """
+    Reads polar files into one array
+    :param filenames: polar files
+    :return: array of DTYPE with the rows of every file, in order
+    """
+    cases, tokens, counts, titles = [], [], [], None
+    for filename in filenames:
+        with open(filename) as f:
+            M, Re, Ncrit, columns, table = split_polar(f.read(), filename)
+        if titles is None:
+            titles = columns
+        elif columns != titles:
+            raise ValueError("%s has columns %s instead of %s" % (filename, columns, titles))
+        table = table.split()
+        if len(table) % len(titles):
+            raise ValueError("%s has an incomplete row" % filename)
+        cases.append((airfoil_name(filename), Re, M, Ncrit))
+        counts.append(len(table)//len(titles))
+        tokens.extend(table)
+    if not cases:
+        return np.zeros(0, DTYPE)
+
+    values = np.array(tokens, dtype=float).reshape(-1, len(titles))
+    rows = np.zeros(len(values), DTYPE)
+    for j, field in enumerate(["airfoil", "Re", "M", "Ncrit"]):
+        rows[field] = np.repeat([case[j] for case in cases], counts)
+    for j, title in enumerate(titles):
+        rows[title] = values[:, j]
+    return rows
+
+def read_polar(filename):
+    "reads one polar file into an array of DTYPE"
+    return read_polars([filename])
+
+def read_polar_dir(directory, pattern="*.pol"):
+    "reads every polar file of a directory into one array of DTYPE"
+    return read_polars(sorted(glob.glob(os.path.join(directory, pattern))))
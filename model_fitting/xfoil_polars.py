@@ -0,0 +1,233 @@
+"""
+Generates the XFOIL polars of the fitting databases on a process pool
+
+Each sweep is a grid of airfoils x Reynolds numbers (in thousands, as in
+the polar file names) x Mach numbers, run at one CL or over a CL sequence.
+Cases whose polar already exists are skipped, so an interrupted run
+resumes where it stopped. Only converged polars are written to the polar
+file; cases that time out, fail, write no points or do not converge are
+recorded in MANIFEST and retried by the next run. The polar XFOIL wrote
+for an empty or non-converged case is left as <polar file>.failed, or
+used as its polar with --keep-nonconverged if it has any points.
+
+Usage:
+    python xfoil_polars.py                          # every sweep
+    python xfoil_polars.py tasopt_tail --workers 8 --timeout 60
+    python xfoil_polars.py naca_tail --dry-run      # list the missing cases
+    python xfoil_polars.py tasopt_c_series --keep-nonconverged
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from multiprocessing import Pool, cpu_count
+
+from xfoil_polar_io import read_polar
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MANIFEST = os.path.join(HERE, "xfoil_manifest.json")
+TAIL_RE = list(range(500, 9500, 500))
+WING_RE = list(range(10000, 35000, 5000))
+WING_THICKNESS = ["090", "100", "110", "120", "130", "140", "145"]
+
+# directory: where the airfoil files are and the polars go
+# airfoil: XFOIL commands loading the airfoil, and the polar file name prefix
+# cl: single CL, or (start, stop, step) of a CL sequence
+# ramp: Mach numbers solved first at alpha 0 to initialize the boundary layer
+SWEEPS = {
+    'naca_tail': {'directory': "Tail Fits",
+                  'airfoils': ["0005", "0008", "0009", "0010", "0015", "0020"],
+                  'load': "naca %s", 'prefix': "naca%s.cl0",
+                  'Re': TAIL_RE, 'M': [0.4, 0.6, 0.8],
+                  'cl': 0.0, 'iter': 400, 'ramp': []},
+    'tasopt_tail': {'directory': "Tail Fits",
+                    'airfoils': ["100", "120", "140"],
+                    'load': "load blade.t%s\npane blade.t%s", 'prefix': "blade.t%s.cl0",
+                    'Re': TAIL_RE, 'M': [0.4, 0.6, 0.8],
+                    'cl': 0.0, 'iter': 400, 'ramp': []},
+    'tasopt_c_series': {'directory': "Wing_Fits",
+                        'airfoils': WING_THICKNESS,
+                        'load': "load blade.c%s\npane blade.c%s", 'prefix': "blade.c%s",
+                        'Re': WING_RE, 'M': [0.4, 0.5, 0.6, 0.7, 0.8, 0.9],
+                        'cl': (.3, .7, .05), 'iter': 100,
+                        'ramp': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9]},
+    'tasopt_e_series': {'directory': "Wing_Fits",
+                        'airfoils': WING_THICKNESS,
+                        'load': "load blade.e%s\npane blade.e%s", 'prefix': "blade.e%s",
+                        'Re': WING_RE, 'M': [0.4, 0.5, 0.6, 0.7, 0.8, 0.9],
+                        'cl': (.3, .7, .05), 'iter': 100,
+                        'ramp': [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.85, 0.9]},
+}
+
+def polar_path(sweep, airfoil, Re, M):
+    options = SWEEPS[sweep]
+    return os.path.join(HERE, options['directory'],
+                        "%s.Re%dk.M%s.pol" % (options['prefix'] % airfoil, Re, M))
+
+def failed_path(polarfile):
+    "where the polar of a non-converged case is kept, out of the polar files' pattern"
+    return polarfile + ".failed"
+
+def cases(sweeps):
+    "(sweep, airfoil, Re, M) of every case of the sweeps"
+    return [(sweep, airfoil, Re, M) for sweep in sweeps
+            for M in SWEEPS[sweep]['M']
+            for Re in SWEEPS[sweep]['Re']
+            for airfoil in SWEEPS[sweep]['airfoils']]
+
+def xfoil_commands(sweep, airfoil, Re, M, polarfile):
+    "XFOIL input of a case, writing its polar to polarfile"
+    options = SWEEPS[sweep]
+    load = options['load'] % ((airfoil,)*options['load'].count("%s"))
+    lines = [load, "oper", "v %se3" % Re]
+    for ramp in options['ramp']:
+        lines += ["M %s" % ramp, "a 0"]
+    lines += ["M %s" % M, "pacc", polarfile, "", "iter %i" % options['iter']]
+    if isinstance(options['cl'], tuple):
+        lines.append("cseq %s %s %s" % options['cl'])
+    else:
+        lines.append("cl %s" % options['cl'])
+    lines += ["", "quit", ""]
+    return "\n".join(lines)
+
+def run_case(args):
+    """
+    Runs XFOIL on one case, in a worker process
+    :param args: ((sweep, airfoil, Re, M), xfoil executable, timeout in seconds,
+                  whether to keep the points of non-converged cases as their polar)
+    :return: (polar file, manifest record or None if the case converged)
+    """
+    (sweep, airfoil, Re, M), xfoil, timeout, keep_nonconverged = args
+    polarfile = polar_path(sweep, airfoil, Re, M)
+    # XFOIL appends to existing polars, so write a fresh one and move it in place;
+    # its name does not match the archive's *.pol, in case the worker dies first
+    tmpfile = os.path.join(os.path.dirname(polarfile), "tmp.%i.pol.part" % os.getpid())
+    if os.path.exists(tmpfile):
+        os.remove(tmpfile)
+    record = {'sweep': sweep, 'airfoil': airfoil, 'Re': Re, 'M': M}
+    start = time.time()
+    try:
+        process = subprocess.Popen([xfoil], cwd=os.path.dirname(polarfile),
+                                   stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, universal_newlines=True)
+        try:
+            output = process.communicate(xfoil_commands(sweep, airfoil, Re, M,
+                                                        os.path.basename(tmpfile)),
+                                         timeout=timeout)[0]
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            if os.path.exists(tmpfile):
+                os.remove(tmpfile)
+            record.update({'status': 'timeout', 'time': time.time() - start})
+            return polarfile, record
+    except OSError as e:
+        record.update({'status': 'failed', 'reason': str(e)})
+        return polarfile, record
+    record['time'] = time.time() - start
+
+    try:
+        rows = len(read_polar(tmpfile))
+    except (IOError, OSError, ValueError) as e:
+        record.update({'status': 'failed', 'reason': str(e),
+                       'returncode': process.returncode})
+        if os.path.exists(tmpfile):
+            os.remove(tmpfile)
+        return polarfile, record
+    if not rows:
+        os.replace(tmpfile, failed_path(polarfile))
+        record.update({'status': 'empty', 'rows': 0,
+                       'polar': os.path.relpath(failed_path(polarfile), HERE)})
+        return polarfile, record
+    converged = "Convergence failed" not in output
+    target = polarfile if converged or keep_nonconverged else failed_path(polarfile)
+    os.replace(tmpfile, target)
+    if target == polarfile and os.path.exists(failed_path(polarfile)):
+        os.remove(failed_path(polarfile))
+    if not converged:
+        record.update({'status': 'nonconverged', 'rows': rows,
+                       'polar': os.path.relpath(target, HERE)})
+        return polarfile, record
+    return polarfile, None
+
+def load_manifest(filename=MANIFEST):
+    try:
+        with open(filename) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return {}
+
+def save_manifest(manifest, filename=MANIFEST):
+    with open(filename + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(filename + ".tmp", filename)
+
+def missing(sweeps):
+    "cases of sweeps without a polar file, including those that failed before"
+    return [case for case in cases(sweeps) if not os.path.exists(polar_path(*case))]
+
+def generate(sweeps, workers=None, timeout=120., xfoil="xfoil", manifest=MANIFEST,
+             keep_nonconverged=False):
+    """
+    Runs the missing cases of sweeps, recording failures in the manifest
+    :param keep_nonconverged: use the points of non-converged cases as their polar
+    :return: number of cases run and number of them that failed or did not converge
+    """
+    todo = missing(sweeps)
+    records = load_manifest(manifest)
+    bad = 0
+    pool = Pool(workers or cpu_count())
+    try:
+        results = pool.imap_unordered(run_case, [(case, xfoil, timeout, keep_nonconverged)
+                                                 for case in todo])
+        for i, (polarfile, record) in enumerate(results):
+            name = os.path.relpath(polarfile, HERE)
+            if record is None:
+                records.pop(name, None)
+            else:
+                records[name] = record
+                bad += 1
+            print("[%i/%i] %s %s" % (i + 1, len(todo), name,
+                                     record['status'] if record else "ok"))
+            save_manifest(records, manifest)
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+    return len(todo), bad
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument('sweeps', nargs='*', help='sweeps to run, of %s (default: all)'
+                        % ", ".join(sorted(SWEEPS)))
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--timeout', type=float, default=120., help='seconds allowed per case')
+    parser.add_argument('--xfoil', default='xfoil', help='XFOIL executable')
+    parser.add_argument('--dry-run', action='store_true', help='only list the missing cases')
+    parser.add_argument('--keep-nonconverged', action='store_true',
+                        help='use the converged points of non-converged cases as their polar')
+    args = parser.parse_args(argv)
+
+    sweeps = args.sweeps or sorted(SWEEPS)
+    for sweep in sweeps:
+        if sweep not in SWEEPS:
+            parser.error("unknown sweep %s" % sweep)
+    if args.dry_run:
+        records = load_manifest()
+        for case in missing(sweeps):
+            name = os.path.relpath(polar_path(*case), HERE)
+            print("%s %s" % (name, records[name]['status']) if name in records else name)
+        return 0
+    ran, bad = generate(sweeps, args.workers, args.timeout, args.xfoil,
+                        keep_nonconverged=args.keep_nonconverged)
+    print("Ran %i cases, %i failed or did not converge (see %s)" % (ran, bad, MANIFEST))
+    return 1 if bad else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+LRU cache of design server results, keyed on the requested design parameters
+and on the model sources, so results persisted by an older model are not reused
+"""
+from __future__ import absolute_import
+from builtins import str
+import os
+import json
+import hashlib
+from shutil import copyfile
+from collections import OrderedDict
+
+from solstore import subs_hash
+from model_cache import source_hash
+
+_source_hash = None
+
+def model_hash():
+    "model_cache.source_hash, computed once per process like MissionCache.hash"
+    global _source_hash
+    if _source_hash is None:
+        _source_hash = source_hash()
+    return _source_hash
+
+def canonical(value):
+    """
+    Returns value with numbers as floats and dictionaries sorted,
+    so equal requests serialize identically
+    """
+    if isinstance(value, dict):
+        return OrderedDict((str(k), canonical(v)) for k, v in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return [canonical(v) for v in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+def request_key(design_parameters, base_substitutions):
+    """
+    Returns the cache key of a request: a hash of its design parameters,
+    of the substitutions they are applied on top of and of the model sources
+    """
+    h = hashlib.sha1(json.dumps(canonical(design_parameters)).encode())
+    h.update(subs_hash(base_substitutions).encode())
+    h.update(model_hash().encode())
+    return h.hexdigest()
+
+class ResultCache(object):
+    """
+    Least-recently-used cache of results, optionally persisted to disk
+
+    Values are dictionaries that must be JSON-serializable (e.g. the message
+    sent to the client), along with the files generated for that result.
+    With a path, every stored result and copies of its files are also
+    written there, so the cache survives server restarts and later
+    overwrites of the original files; entries evicted from memory are then
+    reloaded from disk on their next use.
+
+    ARGUMENTS
+    ---------
+    maxsize: number of results kept in memory
+    path: directory to persist results in, or None to keep them in memory only
+    """
+
+    def __init__(self, maxsize=256, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()
+        if path and not os.path.isdir(path):
+            os.makedirs(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _filename(self, key):
+        return os.path.join(self.path, key + '.json')
+
+    def get(self, key):
+        "returns the cached value, or None"
+        if key in self._entries:
+            value = self._entries.pop(key)
+        elif self.path and os.path.exists(self._filename(key)):
+            with open(self._filename(key)) as f:
+                value = json.load(f)
+        else:
+            return None
+        self._store(key, value)
+        return value
+
+    def put(self, key, value, files=()):
+        """
+        Stores a value
+        :param key: cache key (see request_key)
+        :param value: dictionary to cache
+        :param files: generated files belonging to the value, listed in value['files']
+        """
+        value = dict(value)
+        if self.path:
+            filedir = os.path.join(self.path, key)
+            if files and not os.path.isdir(filedir):
+                os.makedirs(filedir)
+            copies = []
+            for filename in files:
+                copies.append(os.path.join(filedir, os.path.basename(filename)))
+                copyfile(filename, copies[-1])
+            files = copies
+        value['files'] = list(files)
+        self._entries.pop(key, None)
+        self._store(key, value)
+        if self.path:
+            with open(self._filename(key), 'w') as f:
+                json.dump(value, f)
+
+    def _store(self, key, value):
+        self._entries[key] = value
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
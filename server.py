@@ -1,27 +1,89 @@
+"""
+Websocket design server for the ESP front end
+
+Design requests are queued and solved by a pool of worker processes, so
+the server keeps answering every connected client while solves run.
+Each request is answered immediately with a job id:
+    {"status": "queued", "job": 3}
+and the result is pushed to the same client when the job finishes:
+    {"status": "optimal", "job": 3, "msg": "..."}
+While a job solves, every SP iteration is streamed to its client:
+    {"status": "progress", "job": 3, "iteration": 4,
+     "W_{f_{total}}": 28123.4, "delta": -0.0012}
+where delta is the relative change of the objective from the previous
+iteration. Sending {"cancel": 3} stops job 3 at its next iteration (or
+before it starts) and answers {"status": "cancelled", "job": 3}. Clients
+can only cancel their own running or waiting jobs; any other id is
+answered with {"status": "unknown", "job": 3} and nothing is cancelled.
+Each client has at most one job solving and one waiting: a new request
+supersedes the client's earlier ones, cancelling its running job and
+replacing its waiting one, so only the latest parameters are solved.
+Requests may name one of SERVER_CONFIGS with a "config" entry (default
+'optimalD8'); each worker builds and validates the Mission of every
+served configuration once, when it starts, and requests only change
+substitutions. The ESP .csm files are written with the D8.2 geometry
+template (see saveSol.gencsm) whatever the configuration.
+Results are cached by design parameters: repeating a request copies the
+earlier job's files to the new job id and answers at once, with
+"cached": true and no "queued" message.
+"""
 from __future__ import print_function
 from __future__ import absolute_import
 from builtins import str
 from SimpleWebSocketServer import SimpleWebSocketServer, WebSocket
 import json
-from .SPaircraft import Mission
-from .saveSol import gendes, gencsm
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from multiprocessing import Manager
+from itertools import count
+from queue import Empty
 from shutil import copyfile
 
-from .subs.optimalD8 import get_optimalD8_subs
-from .aircraft import Mission
-from .SPaircraft import optimize_aircraft
+from gpkit.small_scripts import mag
+
+from subs import get_subs
+from subs.registry import compile_subs
+from model_cache import load_mission
+from solstore import SolutionStore
+from result_cache import ResultCache, request_key
+from SPaircraft import optimize_aircraft
+from timing import sp_iterations
 
 EXIT = [False]
-ID = 0
-LASTSOL = [None]
+WORKERS = 4
+JOB_IDS = count()
+JOBS = {}  # job id: (client, cache key, future)
+ACTIVE = {}  # client: id of its submitted job
+PENDING = {}  # client: (job id, design parameters) waiting for its active job to end
+CLIENTS = set()
+STORE = SolutionStore('sols/solutions.h5')
+
+# Served configurations and their engine options (as benchmarked in benchmark.py)
+SERVER_CONFIGS = {
+    'optimalD8':   {'fixedBPR': False, 'pRatOpt': True},
+    'optimal737':  {'fixedBPR': True, 'pRatOpt': False},
+    'optimal777':  {'fixedBPR': False, 'pRatOpt': False},
+    'M072_737':    {'fixedBPR': True, 'pRatOpt': False},
+    'D8_no_BLI':   {'fixedBPR': True, 'pRatOpt': False},
+    'D8_eng_wing': {'fixedBPR': True, 'pRatOpt': False},
+}
+BASE_SUBS = dict((config, get_subs(config)) for config in SERVER_CONFIGS)
+MODELS = {}  # config: (Mission model, its pristine substitutions, compiled substitutions), per worker
+# set CACHE_DIR to None to keep cached results in memory only
+CACHE_DIR = 'sols/results'
+RESULTS = ResultCache(256, CACHE_DIR)
+
+# Files generated for each job, formatted with the job id
+ARTIFACTS = ["sol_%03i.txt", "ESP/d82-%i.csm"]
+
+
+def artifacts(ID):
+    return [name % ID for name in ARTIFACTS]
 
 
-def genfiles(m, sol):
-    global ID
+def genfiles(m, sol, config, ID):
+    from saveSol import gencsm
     gensoltxt(m, sol, ID)
-    gencsm(m, sol, 'optimalD8', ID)
-    copyfile("d82.csm", "d82_%03i.csm" % ID)
-    ID += 1
+    gencsm(m, sol, config, ID)
 
 
 def gensoltxt(m, sol, ID):
@@ -32,40 +94,263 @@ def gensoltxt(m, sol, ID):
                                          sol["variables"][var]))
 
 
+def validate_model(m, config):
+    "checks that every base substitution and design parameter is in the model"
+    missing = [name for name in BASE_SUBS[config] if name not in m.varkeys]
+    missing += [name for name, var in m.aircraft.design_parameters.items()
+                if var.key not in m.varkeys]
+    if missing:
+        raise ValueError("%s model is missing %s" % (config, ", ".join(map(str, missing))))
+
+
+def copy_value(value):
+    return value.copy() if hasattr(value, 'copy') else value
+
+
+def restore_subs(m, pristine):
+    """
+    Resets a model's substitutions in place, by varkey, so the KeyDict keeps
+    resolving variable names
+    :param pristine: {varkey: value} of the substitutions to reset to
+    """
+    subs = m.substitutions
+    for key in [key for key in dict.keys(subs) if key not in pristine]:
+        del subs[key]
+    subs.update((key, copy_value(value)) for key, value in pristine.items())
+
+
+def build_models():
+    "builds and validates the Mission of each served configuration"
+    for config in SERVER_CONFIGS:
+        m = load_mission(3, 2, config, 1)
+        m.cost = m['W_{f_{total}}']
+        validate_model(m, config)
+        compiled = compile_subs(m, config, **SERVER_CONFIGS[config])
+        pristine = dict((key, copy_value(value)) for key, value in dict.items(m.substitutions))
+        MODELS[config] = (m, pristine, compiled)
+
+
+def request_config(design_parameters):
+    "served configuration a request asks for"
+    config = design_parameters.get("config", "optimalD8")
+    if config not in SERVER_CONFIGS:
+        raise ValueError("configuration %s is not served" % config)
+    return config
+
+
+class SolveCancelled(Exception):
+    "raised in a worker when its job is cancelled by the client"
+    pass
+
+
+def solve_design(ID, design_parameters, progress=None, cancelled=None):
+    """
+    Solves a design request in a worker process
+    :param ID: job id, used to number the generated files
+    :param design_parameters: dictionary of {design parameter name: value}
+    :param progress: queue that a message is put on after every SP iteration
+    :param cancelled: shared dictionary of {job id: True} for cancelled jobs
+    :return: (message for the client, solution, config, substitutions it was solved with)
+    """
+    if cancelled is not None and cancelled.get(ID):
+        # cancelled while queued
+        raise SolveCancelled(ID)
+    config = request_config(design_parameters)
+    if not MODELS:
+        build_models()
+    m, pristine, compiled = MODELS[config]
+    restore_subs(m, pristine)
+
+    overrides = {}
+    for name, value in list(design_parameters.items()):
+        if name == "config":
+            continue
+        try:
+            overrides[m.aircraft.design_parameters[name]] = value
+        except KeyError as e:
+            print(repr(e))
+    substitutions = compiled.case(overrides)
+
+    last = {'cost': None}
+
+    def report(info):
+        if cancelled is not None and cancelled.get(ID):
+            raise SolveCancelled(ID)
+        if progress is not None:
+            delta = None
+            if last['cost']:
+                delta = (info['cost'] - last['cost'])/last['cost']
+            progress.put({"status": "progress", "job": ID,
+                          "iteration": info['iteration'],
+                          "W_{f_{total}}": info['cost'], "delta": delta})
+        last['cost'] = info['cost']
+
+    with sp_iterations(report):
+        sol = optimize_aircraft(m, substitutions, SERVER_CONFIGS[config]['fixedBPR'],
+                                SERVER_CONFIGS[config]['pRatOpt'])
+    genfiles(m, sol, config, ID)
+    return ({"status": "optimal", "job": ID,
+             "msg": ("Successfully optimized."
+                     " Optimal fuel burn: %.1f lbf "
+                     % mag(sol('W_{f_{total}}').to('lbf')).sum())},
+            sol, config, m.substitutions)
+
+
+def submit(client, design_parameters, ID=None):
+    "queues a design request on the worker pool and returns its job id"
+    if ID is None:
+        ID = next(JOB_IDS)
+    ACTIVE[client] = ID
+    key = request_key(design_parameters, BASE_SUBS[request_config(design_parameters)])
+    JOBS[ID] = (client, key, POOL.submit(solve_design, ID, design_parameters,
+                                         PROGRESS, CANCELLED))
+    return ID
+
+
+def request(client, design_parameters):
+    """
+    Handles a design request, superseding the client's earlier requests
+    :return: message answering the request
+    """
+    superseded = PENDING.pop(client, None)
+    if superseded is not None and client in CLIENTS:
+        client.send({"status": "cancelled", "job": superseded[0],
+                     "msg": "Superseded job %i." % superseded[0]})
+    msg = cached_result(design_parameters)
+    if msg is not None:
+        if client in ACTIVE:
+            cancel(ACTIVE[client])
+        return msg
+    ID = next(JOB_IDS)
+    if client in ACTIVE:
+        # solve once the active job has been cancelled
+        cancel(ACTIVE[client])
+        PENDING[client] = (ID, design_parameters)
+    else:
+        submit(client, design_parameters, ID)
+    return {"status": "queued", "job": ID}
+
+
+def drop_client(client):
+    "cancels all of a client's jobs"
+    PENDING.pop(client, None)
+    if client in ACTIVE:
+        cancel(ACTIVE[client])
+
+
+def cancel_request(client, ID):
+    """
+    Handles a client's request to cancel one of its jobs
+    :return: message answering the request, or None if the job's own
+             message answers it when the job stops
+    """
+    if client in PENDING and PENDING[client][0] == ID:
+        del PENDING[client]
+        return {"status": "cancelled", "job": ID, "msg": "Cancelled job %i." % ID}
+    if ACTIVE.get(client) == ID:
+        cancel(ID)
+        return None
+    return {"status": "unknown", "job": ID,
+            "msg": "Job %s is not one of your running or waiting jobs." % ID}
+
+
+def cancel(ID):
+    "cancels a job, whether it is queued or already solving"
+    if ID in JOBS and not JOBS[ID][2].cancel():
+        CANCELLED[ID] = True
+
+
+def poll_progress():
+    "forwards the iteration progress of running jobs to their clients"
+    while True:
+        try:
+            msg = PROGRESS.get_nowait()
+        except Empty:
+            return
+        if msg["job"] in JOBS:
+            client = JOBS[msg["job"]][0]
+            if client in CLIENTS:
+                client.send(msg)
+
+
+def cached_result(design_parameters):
+    """
+    Returns the message for a previously solved request, after copying its
+    files to a new job id, or None if the request has not been solved yet
+    """
+    base_subs = BASE_SUBS[request_config(design_parameters)]
+    cached = RESULTS.get(request_key(design_parameters, base_subs))
+    if cached is None:
+        return None
+    ID = next(JOB_IDS)
+    try:
+        for src, dst in zip(cached['files'], artifacts(ID)):
+            copyfile(src, dst)
+    except (IOError, OSError):
+        return None
+    msg = dict(cached['msg'])
+    msg.update({"job": ID, "cached": True})
+    return msg
+
+
+def persist(ID, key, msg, sol, config, substitutions):
+    """
+    Stores a finished job's solution and caches its result; a failure is
+    only logged, so the client still gets the solution
+    """
+    try:
+        STORE.append(sol, config=config, substitutions=substitutions, id=ID)
+    except Exception as e:
+        print("Could not store the solution of job %i: %s %s" % (ID, type(e), e))
+    try:
+        RESULTS.put(key, {'msg': msg}, artifacts(ID))
+    except Exception as e:
+        print("Could not cache the result of job %i: %s %s" % (ID, type(e), e))
+
+
+def poll_jobs():
+    "pushes the results of finished jobs to their clients"
+    for ID, (client, key, future) in list(JOBS.items()):
+        if not future.done():
+            continue
+        del JOBS[ID]
+        CANCELLED.pop(ID, None)
+        if ACTIVE.get(client) == ID:
+            del ACTIVE[client]
+            if client in PENDING:
+                pending_ID, design_parameters = PENDING.pop(client)
+                submit(client, design_parameters, pending_ID)
+        try:
+            msg, sol, config, substitutions = future.result()
+            persist(ID, key, msg, sol, config, substitutions)
+        except (SolveCancelled, CancelledError):
+            msg = {"status": "cancelled", "job": ID,
+                   "msg": "Cancelled job %i." % ID}
+        except Exception as e:
+            msg = {"status": "unknown", "job": ID,
+                   "msg": "The last solution raised an exception;"
+                          " tweak it and send again."}
+            print(type(e), e)
+        if client in CLIENTS:
+            client.send(msg)
+
+
 class SPaircraftServer(WebSocket):
 
     def handleMessage(self):
         print("< received", repr(self.data))
         try:
-            self.data = json.loads(self.data)
-            print(self.data)
-
-            config = 'optimalD8'
-            substitutions = get_optimalD8_subs()
-            fixedBPR = False
-            pRatOpt = True
-            mutategparg = True
-            m = Mission(3, 2, config, 1)
-            m.cost = m['W_{f_{total}}']
-
-            for name, value in list(self.data.items()):
-                try:
-                    key = m.design_parameters[name]
-                    m.substitutions[key] = value
-                except KeyError as e:
-                    print(repr(e))
-
-            sol = optimize_aircraft(m, substitutions, fixedBPR, pRatOpt, mutategparg)
-            LASTSOL[0] = sol
-            genfiles(m, sol)
-
-            self.send({"status": "optimal",
-                       "msg": ("Successfully optimized."
-                               " Optimal heat transfer: %.1f watts "
-                               % sol["variables"][m.Q])})
+            design_parameters = json.loads(self.data)
+            print(design_parameters)
+            if "cancel" in design_parameters:
+                msg = cancel_request(self, design_parameters["cancel"])
+                if msg is not None:
+                    self.send(msg)
+                return
+            self.send(request(self, design_parameters))
         except Exception as e:
-            self.send({"status": "unknown", "msg": "The last solution"
-                      " raised an exception; tweak it and send again."})
+            self.send({"status": "unknown", "msg": "The last request"
+                      " could not be read; tweak it and send again."})
             print(type(e), e)
 
     def send(self, msg):
@@ -74,24 +359,29 @@ class SPaircraftServer(WebSocket):
 
     def handleConnected(self):
         print(self.address, "connected")
+        CLIENTS.add(self)
 
     def handleClose(self):
         print(self.address, "closed")
-        EXIT[0] = True
+        CLIENTS.discard(self)
+        drop_client(self)
+        if not CLIENTS:
+            EXIT[0] = True
 
 
 if __name__ == "__main__":
-    objective = 'W_{f_{total}}'
-    aircraft = 'optimald8'
-    substitutions = get_optimalD8_subs()
-    fixedBPR = False
-    pRatOpt = True
-    mutategparg = True
-    LASTSOL[0] = None
-    sol = optimize_aircraft(objective, aircraft, substitutions, fixedBPR, pRatOpt, mutategparg, x0 = LASTSOL[0])
-    LASTSOL[0] = sol
-    genfiles(m, sol)
+    # build (and cache on disk) the models once here, so workers start by loading them
+    build_models()
+    POOL = ProcessPoolExecutor(WORKERS, initializer=build_models)
+    MANAGER = Manager()
+    PROGRESS = MANAGER.Queue()
+    CANCELLED = MANAGER.dict()
+    # solve the baseline design, whose files the front end loads first
+    submit(None, {})
     server = SimpleWebSocketServer('', 8000, SPaircraftServer)
     while not EXIT[0]:
         server.serveonce()
+        poll_progress()
+        poll_jobs()
+    POOL.shutdown(wait=False)
     print("Python server has exited.")
@@ -37,5 +37,12 @@ setup(name = 'SPaircraft',
     author='Berk Ozturk, Martin York',
     author_email='bozturk@mit.edu',
     license=license,
-    packages=[],
-    install_requires = ['turbofan', 'gpkit', 'future'])
+    py_modules=['SPaircraft', 'aircraft', 'wing', 'wingbox', 'fuselage', 'horizontal_tail',
+                'vertical_tail', 'landing_gear', 'stand_alone_simple_profile', 'saveSol',
+                'post_compute', 'percent_diff', 'model_cache', 'warmstart', 'solstore',
+                'timing', 'sweep', 'batch', 'aircraft_config', 'family'],
+    packages=['subs'],
+    entry_points = {'console_scripts': ['spaircraft-demo = SPaircraft:main',
+                                        'spaircraft-family = family:main']},
+    install_requires = ['turbofan', 'gpkit', 'future', 'h5py'],
+    extras_require = {'esp': ['watchdog']})
@@ -0,0 +1,160 @@
+"""
+Columnar HDF5 store of solutions, queryable by variable name across runs
+"""
+from __future__ import absolute_import
+from builtins import str
+import os
+import time
+import hashlib
+import numpy as np
+import h5py
+
+from gpkit.small_scripts import mag
+
+from warmstart import subs_magnitudes
+
+STRING = h5py.special_dtype(vlen=str)
+
+def subs_hash(substitutions):
+    """
+    Returns a short hash identifying a set of substitution values
+    """
+    h = hashlib.sha1()
+    for key, value in sorted(subs_magnitudes(substitutions).items()):
+        h.update(key.encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    return h.hexdigest()[:16]
+
+class SolutionStore(object):
+    """
+    Appends solutions to a single HDF5 file, one row per solve
+
+    Every variable is a column: a 2-D dataset of shape (runs, elements), with
+    NaN where a run did not contain that variable. Free variables and
+    sensitivities to constants are kept in separate groups, and per-run
+    metadata (config, substitution hash, solve time, ...) in a third.
+    The file supports a single writer at a time.
+
+    ARGUMENTS
+    ---------
+    filename: path of the HDF5 file, created on the first append
+    """
+
+    groups = ('variables', 'sensitivities')
+
+    def __init__(self, filename='sols/solutions.h5'):
+        self.filename = filename
+
+    def __len__(self):
+        if not os.path.exists(self.filename):
+            return 0
+        with h5py.File(self.filename, 'r') as f:
+            return int(f.attrs.get('nruns', 0))
+
+    def append(self, sol, m=None, config=None, substitutions=None, **metadata):
+        """
+        Appends a solution to the store
+        :param sol: solution to store
+        :param m: model that was solved; supplies config and substitutions if not given
+        :param config: configuration string
+        :param substitutions: substitutions the solution was obtained with
+        :param metadata: additional numerical or string fields to record for this run
+        """
+        if m is not None:
+            if config is None:
+                config = m.aircraft.config
+            if substitutions is None:
+                substitutions = m.substitutions
+        metadata.update({
+            'config': config or '',
+            'subs_hash': subs_hash(substitutions) if substitutions is not None else '',
+            'soltime': float(sol.get('soltime', np.nan)),
+            'cost': float(np.sum(mag(sol['cost']))),
+            'timestamp': time.time(),
+            })
+        columns = {
+            'variables': sol['freevariables'],
+            'sensitivities': sol['sensitivities']['constants'],
+        }
+
+        dirname = os.path.dirname(self.filename)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with h5py.File(self.filename, 'a') as f:
+            row = int(f.attrs.get('nruns', 0))
+            for group in self.groups:
+                self._append_columns(f.require_group(group), row, columns[group])
+            self._append_metadata(f.require_group('meta'), row, metadata)
+            f.attrs['nruns'] = row + 1
+
+    @staticmethod
+    def _append_columns(group, row, values):
+        datasets = dict((ds.attrs['name'], ds) for ds in group.values())
+        for vk, value in values.items():
+            value = np.ravel(np.asarray(mag(value), dtype=float))
+            name = str(vk)
+            if name not in datasets:
+                ds = group.create_dataset('c%i' % len(group), shape=(row, value.size),
+                                          maxshape=(None, None), dtype=float,
+                                          fillvalue=np.nan, chunks=True)
+                ds.attrs['name'] = name
+                ds.attrs['varname'] = vk.name
+                datasets[name] = ds
+            ds = datasets[name]
+            ds.resize((row + 1, max(ds.shape[1], value.size)))
+            ds[row, :value.size] = value
+        # variables absent from this run stay NaN
+        for ds in datasets.values():
+            if ds.shape[0] < row + 1:
+                ds.resize((row + 1, ds.shape[1]))
+
+    @staticmethod
+    def _append_metadata(group, row, metadata):
+        for field, value in metadata.items():
+            if field not in group:
+                if isinstance(value, str):
+                    group.create_dataset(field, shape=(row,), maxshape=(None,), dtype=STRING)
+                else:
+                    group.create_dataset(field, shape=(row,), maxshape=(None,), dtype=float,
+                                         fillvalue=np.nan)
+            group[field].resize((row + 1,))
+            group[field][row] = value
+        for field in group:
+            if group[field].shape[0] < row + 1:
+                group[field].resize((row + 1,))
+
+    def names(self, group='variables'):
+        """
+        Returns the full names of the variables stored in a group
+        """
+        with h5py.File(self.filename, 'r') as f:
+            return [ds.attrs['name'] for ds in f[group].values()]
+
+    def read(self, name, group='variables'):
+        """
+        Returns the values of a variable across all stored runs
+        :param name: full variable name, or the bare name if it is unambiguous
+        :param group: 'variables' or 'sensitivities'
+        :return: array of shape (runs,) for scalars or (runs, elements) for vectors,
+                 NaN for runs that did not contain the variable
+        """
+        with h5py.File(self.filename, 'r') as f:
+            datasets = list(f[group].values())
+            matches = [ds for ds in datasets if ds.attrs['name'] == name]
+            if not matches:
+                matches = [ds for ds in datasets if ds.attrs['varname'] == name]
+            if len(matches) != 1:
+                raise KeyError("%s matches %i stored variables" % (name, len(matches)))
+            values = matches[0][:]
+        return values[:, 0] if values.shape[1] == 1 else values
+
+    def metadata(self, field):
+        """
+        Returns a metadata field (e.g. 'config', 'soltime') across all stored runs
+        """
+        with h5py.File(self.filename, 'r') as f:
+            values = f['meta'][field][:]
+        if values.dtype == object:
+            values = np.array([v.decode() if isinstance(v, bytes) else v for v in values],
+                              dtype=object)
+        return values
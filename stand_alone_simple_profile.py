@@ -5,7 +5,6 @@ from gpkit import Variable, Model, units, SignomialsEnabled, Vectorize
 from gpkit.constraints.sigeq import SignomialEquality as SignomialEquality
 from gpkit.tools import te_exp_minus1
 from gpkit.constraints.tight import Tight as TCS
-import matplotlib.pyplot as plt
 
 """
 Models required to minimize the aircraft total fuel weight. Rate of climb equation taken from John
@@ -1 +1,61 @@
 #subs
+"""
+Substitution dictionaries of the supported configurations
+
+Substitutions are layered: base.py holds the values every configuration
+shares, and each configuration's module updates them with its own. Each
+configuration's module is only imported when its substitutions are first
+requested, so callers pay for the one configuration they solve.
+
+registry.compile_subs resolves a configuration's substitutions against a
+model once, for applying many cases to the same model.
+"""
+from __future__ import absolute_import
+from importlib import import_module
+
+# Module and substitution dictionary function of each supported configuration
+CONFIG_SUBS = {
+    'optimalD8': ('optimalD8', 'get_optimalD8_subs'),
+    'optimal777': ('optimal777', 'get_optimal777_subs'),
+    'optimal737': ('optimal737', 'get_optimal737_subs'),
+    'M072_737': ('M072_737', 'get_M072_737_subs'),
+    'D8_no_BLI': ('D8_no_BLI', 'get_D8_no_BLI_subs'),
+    'D8_eng_wing': ('D8_eng_wing', 'get_D8_eng_wing_subs'),
+}
+
+def subs_function(config):
+    "imports and returns the substitution dictionary function of a configuration"
+    module, function = CONFIG_SUBS[config]
+    return getattr(import_module('.' + module, __name__), function)
+
+def get_subs(config):
+    """
+    returns a fresh substitution dic for the given configuration
+    :param config: configuration name or aircraft_config.AircraftConfig
+    """
+    return subs_function(getattr(config, 'name', config))()
+
+def engine_options(substitutions, fixedBPR=False, pRatOpt=True):
+    """
+    Applies the engine options to a substitution dic (in place)
+    :param fixedBPR: boolean specifying whether or not BPR is fixed (depends on config)
+    :param pRatOpt: boolean specifying whether or not pressure ratio is optimized (depends on config)
+    :return: the substitution dic
+    """
+    if fixedBPR:
+        substitutions.update({
+            '\\alpha_{max}': 6.97, #8.62,
+        })
+
+    if pRatOpt:
+        del substitutions['\\pi_{f_D}']
+        del substitutions['\\pi_{lc_D}']
+        del substitutions['\\pi_{hc_D}']
+    return substitutions
+
+def __getattr__(name):
+    # keeps `from subs import get_optimalD8_subs` working without eager imports
+    for config, (_, function) in CONFIG_SUBS.items():
+        if function == name:
+            return subs_function(config)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
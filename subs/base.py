@@ -0,0 +1,119 @@
+from gpkit import units
+import numpy as np
+
+def get_base_subs():
+        """
+        returns the substitutions shared by every configuration; each
+        configuration's module updates them with its own values
+        """
+        M4a = .2
+
+        substitutions = {
+                'N_{land}': 6.,
+                'p_s': 81.*units('cm'),
+                'n_{eng}': 2.,
+                'W_{avg. pass}': 180.*units('lbf'),
+                'W_{carry on}': 15.*units('lbf'),
+                'W_{checked}':40.*units('lbf'),
+                'W_{fix}': 3000.*units('lbf'),
+                'w_{aisle}': 0.51*units('m'),
+                'w_{seat}': 0.5*units('m'),
+                'w_{sys}': 0.1*units('m'),
+                'r_E': 1.,  # [TAS]
+                'p_{\\lambda_{vt}}':1.6,
+                '\\lambda_{cone}': 0.3,  # [TAS]
+                '\\rho_{cone}': 2700.,#*units('kg/m^3'),  # [TAS]
+                '\\rho_{bend}': 2700.,#*units('kg/m^3'),  # [TAS]
+                '\\rho_{floor}': 2700.,#*units('kg/m^3'),  # [TAS]
+                '\\rho_{skin}': 2700.,#*units('kg/m^3'),  # [TAS]
+                '\\sigma_{floor}': 30000. / 0.000145, # [TAS] [Al]
+                '\\sigma_{skin}': 15000. / 0.000145,  # [TAS] [Al]
+                '\\sigma_{bend}': 30000. / 0.000145, # [TAS] [Al]
+                '\\tau_{floor}': 30000. / 0.000145, # [TAS] [Al]
+                'W\'\'_{floor}': 60.,  # [TAS]
+                'W\'\'_{insul}': 22.,  # [TAS]
+                'W\'_{window}': 145.*3.*units('N/m'),  # [TAS]
+                'V_{mn}': 133.76*units('m/s'), 'V_{ne}':143.92*units('m/s'),
+
+                # Fuselage subs
+                'f_{seat}': 0.1,
+                'W_{cargo}': 0.1*units('N'), # Cargo weight determined by W_{avg. pass_{total}}
+
+                '\\Delta P_{over}': 8.382 * units('psi'),
+
+                # Power system and landing gear subs
+                'f_{hpesys}': 0.01, # [TAS]
+
+                # Fractional weights
+                'f_{fadd}': 0.2,  # [TAS]
+                'f_{lugg,1}': 0.4,  # [Philippe]
+                'f_{padd}': 0.35,  # [TAS]
+
+                # Wing substitutions
+                '\\eta': 0.97,
+                '\\rho_0': 1.225*units('kg/m^3'),
+                '\\rho_{fuel}': 817.*units('kg/m^3'),  # Kerosene [TASOPT]
+                'TipReduct': 1.0,
+
+                # Wing fractional weights
+                'FuelFrac': 0.9,
+                'f_{flap}': 0.2,
+                'f_{aileron}': 0.04,
+                'f_{lete}': 0.1,
+                'f_{ribs}': 0.15,
+                'f_{spoiler}': 0.02,
+                'f_{watt}': 0.03,
+
+                # VT substitutions
+                'C_{D_{wm}}': 0.5, # [2]
+                '\\rho_{TO}': 1.225*units('kg/m^3'),
+                'e_{vt}': 0.8,
+                'N_{spar}': 1.,
+                'f_{VT}': 0.4,
+                'c_{d_{fv}}': 0.0060,
+
+                # HT substitutions
+                'f_{ht}': 0.3,
+                'c_{d_{fh}}': 0.0060,
+                
+                #engine system subs
+                'f_{eadd}': 0.1,
+
+                # Engine substitutions
+                '\\pi_{tn}': .995,
+                '\\pi_{b}': .94,
+                '\\pi_{d}': .995,
+                '\\pi_{fn}': .985,
+                'T_{ref}': 288.15,
+                'P_{ref}': 101.325,
+                '\\eta_{HPshaft}': .978,
+                '\\eta_{LPshaft}': .99,
+                '\\eta_{B}': .985,
+
+                'hold_{4a}': 1.+.5*(1.313-1.)*M4a**2.,
+                'r_{uc}': .01,
+                'T_{t_f}': 435.,
+
+                'G_{f}': 1.,
+
+                'HTR_{f_{SUB}}': 1.-.3**2.,
+                'HTR_{lpc_{SUB}}': 1. - 0.6**2.,
+
+                #LG subs
+                'E': 205,
+                'K': 2,
+                'N_s': 2,
+                '\\eta_s': 0.8,
+                '\\lambda_{LG}': 2.5,
+                '\\rho_{st}': 7850,
+                '\\tan(\\phi_{min})': np.tan(15*np.pi/180),
+                '\\sigma_{y_c}': 470E6,
+                'f_{add,m}': 1.5,
+                'f_{add,n}': 1.5,
+                'n_{mg}': 2,
+                'p_{oleo}': 1800,
+                't_{nacelle}': 0.15,
+                'w_{ult}': 10,
+        }
+
+        return substitutions
@@ -0,0 +1,130 @@
+"""
+Substitutions compiled against one model's varkeys
+
+compile_subs resolves a configuration's substitution names to the model's
+varkeys once, converts each value to its varkey's units, and keeps the
+scalar values in one array. Applying a case then writes that array into
+the model's substitutions by varkey, without resolving any names, and a
+sweep changes a case by assigning into the array.
+
+Usage:
+    from subs.registry import compile_subs
+    compiled = compile_subs(m, 'optimalD8')
+    for R in ranges:
+        sol = optimize_aircraft(m, compiled.case({'R_{req}': R*units('nmi')}))
+
+    # or, in the tightest loops, in the varkeys' units
+    values = compiled.values.copy()
+    i = compiled.slot('R_{req}')
+    for R in ranges:
+        values[i] = R
+        compiled.apply(m, values)
+"""
+from __future__ import absolute_import
+import copy
+from numbers import Real
+import numpy as np
+
+from . import get_subs, engine_options
+
+def magnitude(key, value):
+    "value in the units of key, as it is stored in a substitutions KeyDict"
+    value = getattr(value, 'value', value)  # constant monomials
+    if hasattr(value, 'to'):
+        value = value.to(key.units or 'dimensionless').magnitude
+    return value
+
+class CompiledSubstitutions(object):
+    """
+    Substitutions resolved against the varkeys of one model
+
+    Scalar substitutions are kept as one array of values, in the order of
+    keys; vector substitutions and anything else (linked functions, sweeps,
+    single elements of vectors) are set through the model's KeyDict as usual.
+
+    ARGUMENTS
+    ---------
+    m: model the substitutions are resolved against (and set on)
+    substitutions: {variable name or variable: value} dictionary
+    """
+
+    def __init__(self, m, substitutions):
+        subs = m.substitutions
+        # resolves the names and converts the units once
+        subs.update(substitutions)
+
+        self.keys = []
+        self.slots = {}
+        self.arrays = {}
+        self.other = {}
+        values = []
+        for name, value in substitutions.items():
+            key, idx = subs.parse_and_index(name)
+            stored = dict.__getitem__(subs, key)
+            if idx is None and isinstance(stored, Real) and not isinstance(stored, bool):
+                if key not in self.slots:
+                    self.slots[key] = len(self.keys)
+                    self.keys.append(key)
+                    values.append(stored)
+                values[self.slots[key]] = stored
+                self.slots[name] = self.slots[key]
+            elif idx is None and isinstance(stored, np.ndarray) and stored.dtype.kind == 'f':
+                self.arrays[key] = stored.copy()
+            else:
+                self.other[name] = value
+        self.values = np.array(values, dtype=float)
+        self.keyset = frozenset(self.keys)
+
+    def slot(self, name):
+        "index in values of a scalar substitution, by name, variable or varkey"
+        return self.slots[getattr(name, 'key', name)]
+
+    def case(self, overrides=None):
+        """
+        Returns a copy of these substitutions with some values changed
+        :param overrides: {variable name or variable: value} dictionary; values
+                          of substitutions that are not compiled scalars are
+                          set through the KeyDict when the case is applied
+        """
+        case = copy.copy(self)
+        case.values = self.values.copy()
+        case.other = dict(self.other)
+        for name, value in (overrides or {}).items():
+            slot = self.slots.get(getattr(name, 'key', name))
+            if slot is None:
+                case.other[name] = value
+            else:
+                case.values[slot] = magnitude(self.keys[slot], value)
+        return case
+
+    def apply(self, m, values=None):
+        """
+        Sets these substitutions on a model
+        :param m: the model they were compiled against (or a copy of it)
+        :param values: scalar values to use instead of self.values
+        """
+        subs = m.substitutions
+        values = (self.values if values is None else values).tolist()
+        if self.keyset <= dict.keys(subs):
+            # every key is already mapped, so skip the KeyDict's lookups
+            dict.update(subs, zip(self.keys, values))
+        else:
+            subs.update(zip(self.keys, values))
+        for key, array in self.arrays.items():
+            subs[key] = array
+        for name, value in self.other.items():
+            subs[name] = value
+
+def compile_subs(m, config, fixedBPR=False, pRatOpt=True):
+    """
+    Returns a configuration's substitutions compiled against a model,
+    compiling them the first time they are asked for
+    :param config: configuration name or aircraft_config.AircraftConfig
+    :param fixedBPR, pRatOpt: engine options (see subs.engine_options)
+    """
+    cache = m.__dict__.setdefault('compiled_subs', {})
+    key = (getattr(config, 'name', config), fixedBPR, pRatOpt)
+    if key not in cache:
+        cache[key] = CompiledSubstitutions(m, engine_options(get_subs(config), fixedBPR,
+                                                             pRatOpt))
+    return cache[key]
@@ -0,0 +1,79 @@
+"""
+Continuation sweeps over mission requirements (R_{req}, n_{pass}, M_{min}, ...)
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+
+from SPaircraft import optimize_aircraft
+from subs import engine_options
+from subs.registry import CompiledSubstitutions
+
+# Exceptions gpkit raises when a solve fails to converge or is infeasible
+SOLVE_FAILURES = (RuntimeWarning, RuntimeError, ValueError)
+
+def sweep_grid(axes):
+    """
+    Returns the points of a grid ordered so that consecutive points are neighbors
+    The last axis is traversed back and forth (serpentine order), so a
+    continuation never jumps from the end of one row to the start of the next.
+    :param axes: list of (variable name, list of values) pairs
+    :return: list of {variable name: value} dictionaries
+    """
+    points = [{}]
+    for name, values in axes:
+        newpoints = []
+        for i, point in enumerate(points):
+            ordered = values if i % 2 == 0 else values[::-1]
+            for value in ordered:
+                newpoint = dict(point)
+                newpoint[name] = value
+                newpoints.append(newpoint)
+        points = newpoints
+    return points
+
+def interpolate_point(start, end, frac):
+    "point a fraction frac of the way from start to end"
+    return dict((name, start[name] + frac*(end[name] - start[name])) for name in end)
+
+def continuation_sweep(m, substitutions, points, fixedBPR=False, pRatOpt=True,
+                       max_halvings=4, warmstart=None):
+    """
+    Solves an ordered sequence of points, warm-starting each from the last
+    converged one. When a step fails to converge, intermediate points at
+    half, a quarter, ... of the step are solved first.
+    :param m: Mission model with objective
+    :param substitutions: base substitutions, updated by each point
+    :param points: ordered list of {variable name: value} dictionaries (see sweep_grid)
+    :param fixedBPR: passed to optimize_aircraft
+    :param pRatOpt: passed to optimize_aircraft
+    :param max_halvings: number of times a failing step may be halved
+    :param warmstart: WarmStartStore used to seed the first point
+    :return: list of solutions in the order of points, None where the point could not be solved
+    """
+    # resolve the substitutions against the model once; each point only changes values
+    compiled = CompiledSubstitutions(m, engine_options(dict(substitutions), fixedBPR, pRatOpt))
+    sols = []
+    last = None  # last converged point
+    x0 = None
+    for point in points:
+        frac = 1.
+        while True:
+            trial = point if (last is None or frac == 1.) else interpolate_point(last, point, frac)
+            try:
+                sol = optimize_aircraft(m, compiled.case(trial), fixedBPR, pRatOpt, x0=x0,
+                                        warmstart=warmstart if x0 is None else None)
+            except SOLVE_FAILURES as e:
+                if last is None or frac <= 0.5**max_halvings:
+                    print("Continuation failed at %s: %r" % (point, e))
+                    sols.append(None)
+                    break
+                frac /= 2.
+                continue
+            last = trial
+            x0 = sol['freevariables']
+            if trial is point:
+                sols.append(sol)
+                break
+            # take the remainder of the step from the new point
+            frac = 1.
+    return sols
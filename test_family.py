@@ -0,0 +1,63 @@
+"""
+Checks every family member's generated substitutions against the ones
+recorded in family_subs.json, so a change to the D8 layers or to family's
+tables shows up as a diff per member and variable. After an intended change,
+re-record them and review the diff of family_subs.json:
+
+    python test_family.py
+
+Usage:
+    python -m pytest test_family.py
+"""
+from __future__ import print_function
+from __future__ import absolute_import
+import os
+import json
+import numpy as np
+import pytest
+
+import family
+
+EXPECTED = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'family_subs.json')
+
+def quantity(value):
+    "(magnitude, units) of a substitution value, units None if dimensionless"
+    value = getattr(value, 'value', value)
+    if hasattr(value, 'units'):
+        return np.asarray(value.magnitude, float).tolist(), str(value.units)
+    return np.asarray(value, float).tolist(), None
+
+def record(path=EXPECTED):
+    "writes the substitutions of every member to path"
+    table = {}
+    for name, size, M, engines in family.members():
+        subs = family.member_subs(size, M, engines)
+        table[name] = dict((key, quantity(value)) for key, value in subs.items())
+    # one line per substitution, so that drift reads as a line diff
+    with open(path, 'w') as f:
+        f.write('{\n%s\n}\n' % ',\n'.join(
+            ' %s: {\n%s\n }' % (json.dumps(name), ',\n'.join(
+                '  %s: %s' % (json.dumps(key), json.dumps(table[name][key]))
+                for key in sorted(table[name])))
+            for name in sorted(table)))
+
+def recorded(path=EXPECTED):
+    with open(path) as f:
+        return json.load(f)
+
+def test_members_recorded():
+    assert sorted(name for name, _, _, _ in family.members()) == sorted(recorded())
+
+@pytest.mark.parametrize("name, size, M, engines", family.members())
+def test_member_subs(name, size, M, engines):
+    expected = recorded()[name]
+    subs = family.member_subs(size, M, engines)
+    assert sorted(subs) == sorted(expected)
+    for key, (magnitude, units) in expected.items():
+        value = getattr(subs[key], 'value', subs[key])
+        if units is not None:
+            value = value.to(units).magnitude
+        assert np.asarray(value, float).tolist() == pytest.approx(magnitude, rel=1e-9), key
+
+if __name__ == "__main__":
+    record()
@@ -0,0 +1,156 @@
+"""
+Wall time and peak memory instrumentation of the solve pipeline
+"""
+from __future__ import absolute_import
+import json
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from gpkit import GeometricProgram
+try:
+    from gpkit import SignomialProgram as SequentialGP
+except ImportError:
+    from gpkit import SequentialGeometricProgram as SequentialGP
+
+def peak_rss_kb():
+    """
+    Returns the peak resident set size of this process so far, in kB
+    """
+    if resource is None:
+        return float('nan')
+    return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+@contextmanager
+def sp_iterations(callback):
+    """
+    Calls callback after every GP solve of the signomial iterations run
+    inside the context, with a dictionary holding the iteration number, the
+    GP compilation and solver wall times and the objective of that GP.
+    Raising from the callback aborts the localsolve.
+
+    The hooks are installed on the gpkit classes, so they also see solves
+    from other threads of this process while the context is active.
+    """
+    state = {'iteration': 0, 'compile': 0.}
+    gp_method = SequentialGP.gp
+    solve_method = GeometricProgram.solve
+
+    def gp(self, *args, **kwargs):
+        start = time.time()
+        try:
+            return gp_method(self, *args, **kwargs)
+        finally:
+            state['compile'] = time.time() - start
+
+    def solve(self, *args, **kwargs):
+        start = time.time()
+        out = solve_method(self, *args, **kwargs)
+        info = {'iteration': state['iteration'],
+                'compile': state['compile'],
+                'solve': time.time() - start}
+        try:
+            info['cost'] = float(out['objective'])
+        except (KeyError, TypeError):
+            info['cost'] = float(out['cost'])
+        state['iteration'] += 1
+        state['compile'] = 0.
+        callback(info)
+        return out
+
+    SequentialGP.gp = gp
+    GeometricProgram.solve = solve
+    try:
+        yield
+    finally:
+        SequentialGP.gp = gp_method
+        GeometricProgram.solve = solve_method
+
+class SolveTimer(object):
+    """
+    Records the wall time and peak memory of each phase of a solve
+
+    Records are dictionaries with the phase name, its wall time in seconds,
+    the process's peak RSS in kB at the end of the phase and, if
+    trace_memory is set, the peak Python heap allocated during the phase.
+    Each SP iteration gets its own 'sp_iteration' record.
+
+    ARGUMENTS
+    ---------
+    trace_memory: track per-phase Python allocations with tracemalloc (slows the solve)
+    """
+
+    def __init__(self, trace_memory=False):
+        self.records = []
+        self.trace_memory = trace_memory and tracemalloc is not None
+
+    @contextmanager
+    def phase(self, name, **info):
+        "records the phase run inside the context"
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+        start = time.time()
+        try:
+            yield
+        finally:
+            record = {'phase': name, 'wall': time.time() - start,
+                      'peak_rss_kb': peak_rss_kb()}
+            if self.trace_memory:
+                record['peak_traced_kb'] = tracemalloc.get_traced_memory()[1]/1024.
+            record.update(info)
+            self.records.append(record)
+
+    @contextmanager
+    def iterations(self):
+        "records each SP iteration of the localsolve run inside the context"
+        def record(info):
+            info.update({'phase': 'sp_iteration',
+                         'wall': info['compile'] + info['solve'],
+                         'peak_rss_kb': peak_rss_kb()})
+            self.records.append(info)
+        with sp_iterations(record):
+            yield
+
+    @property
+    def n_iterations(self):
+        return sum(1 for record in self.records if record['phase'] == 'sp_iteration')
+
+    def total(self, name):
+        "total wall time spent in a phase"
+        return sum(record['wall'] for record in self.records if record['phase'] == name)
+
+    def to_jsonl(self, filename, **metadata):
+        """
+        Appends the records to a JSON lines file
+        :param filename: file to append to
+        :param metadata: fields added to every record (e.g. config, git revision)
+        """
+        with open(filename, 'a') as f:
+            for record in self.records:
+                line = dict(metadata)
+                line.update(record)
+                f.write(json.dumps(line, sort_keys=True) + '\n')
+
+class NullTimer(SolveTimer):
+    """
+    Timer that records nothing, used when instrumentation is off
+    """
+
+    @contextmanager
+    def phase(self, name, **info):
+        yield
+
+    @contextmanager
+    def iterations(self):
+        yield
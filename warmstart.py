@@ -0,0 +1,123 @@
+"""
+Persistent warm-start store for seeding localsolve with prior solutions
+"""
+from __future__ import absolute_import
+from builtins import str
+import os
+import pickle
+import numpy as np
+
+from gpkit.small_scripts import mag
+
+def subs_magnitudes(substitutions):
+    """
+    Reduces a substitution dictionary to plain numerical magnitudes
+    :param substitutions: substitution dictionary keyed by strings or varkeys
+    :return: dictionary of {variable string: numpy array of magnitudes}
+    """
+    mags = {}
+    for key, value in substitutions.items():
+        try:
+            mags[str(key)] = np.asarray(mag(value), dtype=float)
+        except (TypeError, ValueError):
+            # linked functions and other non-numerical substitutions
+            continue
+    return mags
+
+def subs_distance(a, b):
+    """
+    Relative distance between two sets of substitution magnitudes
+    Variables present in only one of the sets count as a unit difference.
+    """
+    dist = 0.
+    for key in set(a) | set(b):
+        if key not in a or key not in b or a[key].shape != b[key].shape:
+            dist += 1.
+            continue
+        scale = np.maximum(np.abs(a[key]), np.abs(b[key]))
+        diff = np.abs(a[key] - b[key])
+        dist += np.sum(np.where(scale > 0, diff/np.where(scale > 0, scale, 1.), 0.))
+    return dist
+
+class WarmStartStore(object):
+    """
+    On-disk store of converged solutions used as initial guesses (x0)
+
+    Solutions are grouped by (config, Nclimb, Ncruise, Nmission), and within a
+    group the entry whose substitutions are closest to the requested ones is
+    used to seed localsolve.
+
+    ARGUMENTS
+    ---------
+    path: directory holding one pickle file per group
+    max_entries: number of solutions kept per group (oldest are dropped first)
+    """
+
+    def __init__(self, path='warmstart', max_entries=50):
+        self.path = path
+        self.max_entries = max_entries
+
+    @staticmethod
+    def key(m):
+        "returns the group key of a Mission model"
+        return (m.aircraft.config, m.Nclimb, m.Ncruise, m.Nmission)
+
+    def _filename(self, key):
+        return os.path.join(self.path, "%s_%i_%i_%i.pkl" % key)
+
+    def _load(self, key):
+        try:
+            with open(self._filename(key), 'rb') as f:
+                return pickle.load(f)
+        except (IOError, OSError, EOFError, pickle.UnpicklingError):
+            return []
+
+    def _dump(self, key, entries):
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        filename = self._filename(key)
+        # write then rename, so that concurrent readers never see half a file
+        tmpname = "%s.%i.tmp" % (filename, os.getpid())
+        with open(tmpname, 'wb') as f:
+            pickle.dump(entries, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpname, filename)
+
+    def lookup(self, m, substitutions=None):
+        """
+        Returns the stored solution nearest to the model's substitutions
+        :param m: Mission model, with substitutions already updated
+        :param substitutions: substitutions to compare against (default m.substitutions)
+        :return: x0 dictionary keyed by the model's varkeys, or None if nothing is stored
+        """
+        entries = self._load(self.key(m))
+        if not entries:
+            return None
+        if substitutions is None:
+            substitutions = m.substitutions
+        target = subs_magnitudes(substitutions)
+        nearest = min(entries, key=lambda entry: subs_distance(target, entry['subs']))
+
+        varkeys = {}
+        for vk in m.varkeys:
+            vk = vk.veckey or vk
+            varkeys[str(vk)] = vk
+        return dict((varkeys[name], value) for name, value in nearest['x0'].items()
+                    if name in varkeys)
+
+    def record(self, m, sol, substitutions=None):
+        """
+        Adds a converged solution to the store
+        :param m: Mission model that was solved
+        :param sol: solution of that model
+        :param substitutions: substitutions used for the solve (default m.substitutions)
+        """
+        if substitutions is None:
+            substitutions = m.substitutions
+        key = self.key(m)
+        entries = self._load(key)
+        entries.append({
+            'subs': subs_magnitudes(substitutions),
+            'x0': dict((str(vk), np.asarray(mag(value), dtype=float))
+                       for vk, value in sol['freevariables'].items()),
+            })
+        self._dump(key, entries[-self.max_entries:])